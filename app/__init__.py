@@ -6,19 +6,13 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.middleware.sessions import SessionMiddleware
 
-from .db import (
-    engine,
-    Base,
-    ensure_task_owner_column,
-    ensure_task_resurface_columns,
-    ensure_block_title_column,
-    ensure_ritual_table,
-    ensure_ritual_columns,
-    ensure_guidance_reminder_columns,
-)
+from .db import async_db_enabled, async_read_session_factory, close_async_db
+from .migrations import run_migrations
 from .routes import homepage, api, capture, blocks, resurface, weekly, waiting, ritual, auth, coach, long_range, nudges, health, profile, onboarding, tasks, export
 from .security import ensure_csrf_token, current_user, is_authenticated, ui_auth_enabled
-from .utils.health import ensure_health_metrics
+from .utils.coach import start_coach_warmup
+from .utils.calendar_feeds import start_calendar_refresh
+from .utils.llm import close_llm_client
 
 
 def _load_dotenv() -> None:
@@ -52,16 +46,16 @@ def create_app() -> FastAPI:
     Keeps startup logic tidy and makes testing easier.
     """
     _load_dotenv()
-    Base.metadata.create_all(bind=engine)
-    ensure_task_owner_column()
-    ensure_task_resurface_columns()
-    ensure_block_title_column()
-    ensure_ritual_table()
-    ensure_ritual_columns()
-    ensure_guidance_reminder_columns()
-    ensure_health_metrics()
+    schema = run_migrations()
+    if async_db_enabled():
+        async_read_session_factory()  # fail at startup, not on the first request, if aiosqlite is missing
 
     app = FastAPI(title="Start Finishing Organiser", version="0.5")
+    app.state.schema = schema
+    app.add_event_handler("startup", start_coach_warmup)
+    app.add_event_handler("startup", start_calendar_refresh)
+    app.add_event_handler("shutdown", close_llm_client)
+    app.add_event_handler("shutdown", close_async_db)
 
     def _parse_bool(value: str | None) -> bool:
         return bool(value) and value.strip().lower() in ("1", "true", "yes", "on")
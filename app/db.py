@@ -1,19 +1,120 @@
 # Database configuration for Start Finishing Organiser
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import declarative_base, sessionmaker
+import os
+import re
+import threading
+from contextlib import asynccontextmanager
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./sfo.db"
+# Readers open the same file read-only; under WAL they never wait for the writer.
+READ_DATABASE_URL = "sqlite:///file:./sfo.db?mode=ro&uri=true"
+ASYNC_READ_DATABASE_URL = "sqlite+aiosqlite:///file:./sfo.db?mode=ro&uri=true"
+READ_POOL_SIZE = 8
+
+# Storage profiles: PRAGMAs applied to every new SQLite connection, in this order
+# (busy_timeout first so switching journal mode waits out a competing lock).
+# Pick one with SFO_SQLITE_PROFILE; override single PRAGMAs with SFO_SQLITE_PRAGMAS,
+# e.g. "busy_timeout=10000;mmap_size=0".
+SQLITE_PRAGMAS = ("busy_timeout", "journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store")
+SQLITE_PROFILES: dict[str, dict[str, str]] = {
+    # SQLite's own settings: rollback journal, full sync, no mmap. Readers and the writer block each other.
+    "default": {},
+    # WAL lets readers run alongside the writer; NORMAL sync can lose the last commits on power loss, never corrupt.
+    "balanced": {
+        "busy_timeout": "5000",
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "mmap_size": str(64 * 1024 * 1024),
+        "cache_size": "-16000",  # KiB, i.e. ~16 MB per connection
+        "temp_store": "memory",
+    },
+    # As balanced, but every commit is fsynced.
+    "durable": {
+        "busy_timeout": "5000",
+        "journal_mode": "wal",
+        "synchronous": "full",
+        "mmap_size": str(64 * 1024 * 1024),
+        "cache_size": "-16000",
+        "temp_store": "memory",
+    },
+}
+DEFAULT_SQLITE_PROFILE = "balanced"
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9]+$")
+
+
+def storage_pragmas() -> dict[str, str]:
+    """PRAGMAs for new connections, from SFO_SQLITE_PROFILE plus SFO_SQLITE_PRAGMAS overrides."""
+    name = (os.getenv("SFO_SQLITE_PROFILE") or DEFAULT_SQLITE_PROFILE).strip().lower()
+    if name not in SQLITE_PROFILES:
+        raise RuntimeError(f"SFO_SQLITE_PROFILE must be one of: {', '.join(SQLITE_PROFILES)}.")
+    pragmas = dict(SQLITE_PROFILES[name])
+    for entry in re.split(r"[;,]", os.getenv("SFO_SQLITE_PRAGMAS", "")):
+        key, _, value = entry.partition("=")
+        key, value = key.strip().lower(), value.strip()
+        if not key:
+            continue
+        if key not in SQLITE_PRAGMAS or not _PRAGMA_VALUE.match(value):
+            raise RuntimeError(f"Unsupported SFO_SQLITE_PRAGMAS entry: {entry.strip()!r}")
+        pragmas[key] = value
+    return pragmas
+
 
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict[str, str]) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name in SQLITE_PRAGMAS:
+            if name in pragmas:
+                cursor.execute(f"PRAGMA {name} = {pragmas[name]}")
+    finally:
+        cursor.close()
+
+
+# SQLite allows one writer at a time, so the write pool is one connection: writers queue
+# here instead of spinning on busy_timeout, and reads never take that connection.
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
+    pool_size=1,
+    max_overflow=0,
+)
+read_engine = create_engine(
+    READ_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=READ_POOL_SIZE,
+    max_overflow=READ_POOL_SIZE,
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(engine, "connect")
+def _apply_storage_profile(dbapi_connection, connection_record):
+    # Read at connect time: create_app loads .env after this module is imported.
+    apply_sqlite_pragmas(dbapi_connection, storage_pragmas())
+
+
+@event.listens_for(read_engine, "connect")
+def _apply_read_profile(dbapi_connection, connection_record):
+    # The journal mode is a property of the file; the writer sets it and read-only handles can't.
+    pragmas = storage_pragmas()
+    pragmas.pop("journal_mode", None)
+    apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+
+class TrackedSession(Session):
+    """Session whose commits bump the data versions below; the sync and async paths both use it."""
+
+
+SessionLocal = sessionmaker(class_=TrackedSession, autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 
 def get_db():
+    """Write-intent session: for handlers that add, change or delete rows."""
     db = SessionLocal()
     try:
         yield db
@@ -21,6 +122,167 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Read-intent session on a read-only connection; any write through it fails."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Optional async path (SFO_ASYNC_DB=1, needs aiosqlite). Hot handlers depend on
+# get_async_read_db/get_async_db and hand their ORM code to run_db: with the flag on, reads
+# await aiosqlite instead of holding a Starlette threadpool worker; with it off, the code runs
+# in the threadpool as before. Writes always go through the single sync writer.
+_ASYNC_DB: dict = {"engine": None, "read": None}
+_ASYNC_DB_LOCK = threading.Lock()
+
+
+def async_db_enabled() -> bool:
+    return os.getenv("SFO_ASYNC_DB", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def async_read_session_factory() -> async_sessionmaker:
+    """Async sessionmaker on a read-only pool sized like the sync one.
+
+    There is no async writer: a second write connection would race `engine` through
+    busy_timeout, so write intent always gets a SessionLocal (see _async_session).
+    """
+    with _ASYNC_DB_LOCK:
+        if _ASYNC_DB["read"] is None:
+            try:
+                import aiosqlite  # noqa: F401
+            except ImportError as exc:
+                raise RuntimeError("SFO_ASYNC_DB needs the aiosqlite package (pip install aiosqlite).") from exc
+            # aiosqlite defaults to NullPool, a fresh connection (and thread) per checkout.
+            async_read_engine = create_async_engine(
+                ASYNC_READ_DATABASE_URL,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=READ_POOL_SIZE,
+                max_overflow=READ_POOL_SIZE,
+            )
+            event.listen(async_read_engine.sync_engine, "connect", _apply_read_profile)
+            _ASYNC_DB["engine"] = async_read_engine
+            _ASYNC_DB["read"] = async_sessionmaker(async_read_engine, autoflush=False)
+        return _ASYNC_DB["read"]
+
+
+async def close_async_db() -> None:
+    if _ASYNC_DB["engine"] is not None:
+        await _ASYNC_DB["engine"].dispose()
+
+
+@asynccontextmanager
+async def _async_session(read: bool):
+    if read and async_db_enabled():
+        async with async_read_session_factory()() as session:
+            yield session
+        return
+    # Writes share the one writer connection with sync handlers; run_db takes them to the threadpool.
+    db = (ReadSessionLocal if read else SessionLocal)()
+    try:
+        yield db
+    finally:
+        db.close()  # run_db already released the connection; this only drops the object
+
+
+async def get_async_db():
+    """Write intent: a Session on the single writer, whatever SFO_ASYNC_DB says; pass it to run_db."""
+    async with _async_session(read=False) as session:
+        yield session
+
+
+async def get_async_read_db():
+    """Read intent: an AsyncSession on the read-only pool when SFO_ASYNC_DB is on, else a Session."""
+    async with _async_session(read=True) as session:
+        yield session
+
+
+def _call_and_release(db: Session, fn, *args, **kwargs):
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+async def run_db(db: Session | AsyncSession, fn, *args, **kwargs):
+    """Run `fn(session, *args, **kwargs)` as one unit of work and return its result.
+
+    `fn` is ordinary sync ORM code. An AsyncSession runs it through run_sync, so each query
+    awaits aiosqlite but the Python in between runs on the event loop; a plain Session runs
+    it in the threadpool. Keep `fn` to queries: eager-load what the page needs and render
+    afterwards with run_in_threadpool. The session is closed once `fn` returns, so no
+    connection is held across a slow LLM call and rows come back detached.
+    """
+    if isinstance(db, AsyncSession):
+        try:
+            return await db.run_sync(fn, *args, **kwargs)
+        finally:
+            await db.close()
+    return await run_in_threadpool(_call_and_release, db, fn, *args, **kwargs)
+
+
+# Per-table data versions in the data_versions table, bumped inside every commit that touched
+# the table, so all workers see them. Caches key their snapshots on these so they only rebuild
+# when data changes.
+_TOUCHED_TABLES_KEY = "sfo_touched_tables"
+_BUMP_DATA_VERSION = text(
+    "INSERT INTO data_versions (table_name, version) VALUES (:table_name, 1) "
+    "ON CONFLICT (table_name) DO UPDATE SET version = version + 1"
+)
+
+
+def data_versions(db: Session, *tables: str) -> tuple[int, ...]:
+    """Return the current data version for each table name, in order, as `db` sees them.
+
+    Read in the caller's transaction, so the versions match the rows it reads next.
+    """
+    rows = dict(db.execute(text("SELECT table_name, version FROM data_versions")).all())
+    return tuple(rows.get(table, 0) for table in tables)
+
+
+def bump_data_version(db: Session, *tables: str) -> None:
+    """Bump the versions of `tables` in `db`'s transaction; they move only if it commits."""
+    if tables:
+        db.execute(_BUMP_DATA_VERSION, [{"table_name": table} for table in sorted(tables)])
+
+
+def _touched_tables(session) -> set[str]:
+    return session.info.setdefault(_TOUCHED_TABLES_KEY, set())
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    touched = _touched_tables(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            touched.add(table)
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        _touched_tables(orm_execute_state.session).update(t.name for t in mapper.tables)
+
+
+@event.listens_for(TrackedSession, "before_commit")
+def _bump_touched_tables(session):
+    session.flush()  # commit flushes after this hook; flush first so its tables are counted
+    touched = session.info.pop(_TOUCHED_TABLES_KEY, None)
+    if touched:
+        bump_data_version(session, *touched)
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _discard_touched_tables(session):
+    session.info.pop(_TOUCHED_TABLES_KEY, None)
+
+
 def ensure_task_owner_column():
     """Ensure tasks.owner_type exists for ownership (mine/shared/OPP) classification."""
     with engine.connect() as conn:
@@ -137,15 +399,54 @@ def ensure_guidance_reminder_columns():
             )
 
 
+def ensure_coach_message_context_column():
+    """Ensure coach_messages.context_id exists for deduplicated screen contexts."""
+    with engine.connect() as conn:
+        cols = {row[1] for row in conn.execute(text("PRAGMA table_info(coach_messages);")).fetchall()}
+        if not cols:
+            return
+        if "context_id" not in cols:
+            conn.execute(text("ALTER TABLE coach_messages ADD COLUMN context_id VARCHAR(64) NULL"))
+
+
+def ensure_coach_conversation_summary_columns():
+    """Ensure coach_conversations.summary and summary_through_id exist for rolling summaries."""
+    with engine.connect() as conn:
+        cols = {row[1] for row in conn.execute(text("PRAGMA table_info(coach_conversations);")).fetchall()}
+        if not cols:
+            return
+        if "summary" not in cols:
+            conn.execute(text("ALTER TABLE coach_conversations ADD COLUMN summary TEXT NULL"))
+        if "summary_through_id" not in cols:
+            conn.execute(text("ALTER TABLE coach_conversations ADD COLUMN summary_through_id INTEGER NULL"))
+
+
 __all__ = [
     "engine",
+    "read_engine",
     "SessionLocal",
+    "ReadSessionLocal",
+    "TrackedSession",
     "Base",
     "get_db",
+    "get_read_db",
+    "async_db_enabled",
+    "async_read_session_factory",
+    "close_async_db",
+    "get_async_db",
+    "get_async_read_db",
+    "run_db",
+    "SQLITE_PROFILES",
+    "storage_pragmas",
+    "apply_sqlite_pragmas",
+    "data_versions",
+    "bump_data_version",
     "ensure_task_owner_column",
     "ensure_task_resurface_columns",
     "ensure_block_title_column",
     "ensure_ritual_table",
     "ensure_ritual_columns",
     "ensure_guidance_reminder_columns",
+    "ensure_coach_message_context_column",
+    "ensure_coach_conversation_summary_columns",
 ]
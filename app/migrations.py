@@ -0,0 +1,137 @@
+# Versioned schema migrations for Start Finishing Organiser
+"""Schema upgrades, stamped in SQLite's `PRAGMA user_version`.
+
+A warm start reads the stamp once and returns. Otherwise the pending steps run in order
+under a file lock next to the database, so several workers starting together never race
+each other's ALTER TABLEs; each step is stamped as soon as it succeeds.
+
+To change the schema, append a step to MIGRATIONS; never edit or reorder released ones.
+"""
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy import text
+
+from . import models  # noqa: F401  (registers every table on Base.metadata)
+from .db import (
+    engine,
+    Base,
+    ensure_task_owner_column,
+    ensure_task_resurface_columns,
+    ensure_block_title_column,
+    ensure_ritual_table,
+    ensure_ritual_columns,
+    ensure_guidance_reminder_columns,
+    ensure_coach_message_context_column,
+    ensure_coach_conversation_summary_columns,
+)
+from .utils.health import ensure_health_metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev server, no cross-process lock needed
+    fcntl = None
+
+
+def _baseline() -> None:
+    """Create missing tables and bring databases from before versioning up to date.
+
+    The column helpers probe before altering, so this is safe on any earlier schema.
+    """
+    Base.metadata.create_all(bind=engine)
+    ensure_task_owner_column()
+    ensure_task_resurface_columns()
+    ensure_block_title_column()
+    ensure_ritual_table()
+    ensure_ritual_columns()
+    ensure_guidance_reminder_columns()
+    ensure_coach_message_context_column()
+    ensure_coach_conversation_summary_columns()
+
+
+def _hot_path_indexes() -> None:
+    """Create the indexes declared in models' __table_args__ on databases that predate them."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _calendar_parse_key() -> None:
+    """Add calendar_feed_cache.parse_key; snapshots without one are fetched unconditionally."""
+    with engine.begin() as conn:
+        cols = {row[1] for row in conn.execute(text("PRAGMA table_info(calendar_feed_cache);")).fetchall()}
+        if cols and "parse_key" not in cols:
+            conn.execute(text("ALTER TABLE calendar_feed_cache ADD COLUMN parse_key VARCHAR(64) NULL"))
+
+
+def _data_versions_table() -> None:
+    """Create data_versions, which replaces the per-process counters cache keys were built on."""
+    models.DataVersion.__table__.create(bind=engine, checkfirst=True)
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[], None]]] = [
+    (1, "baseline schema", _baseline),
+    (2, "default health metrics", ensure_health_metrics),
+    (3, "hot-path indexes", _hot_path_indexes),
+    (4, "calendar feed parse key", _calendar_parse_key),
+    (5, "shared data versions", _data_versions_table),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version() -> int:
+    with engine.connect() as conn:
+        return int(conn.exec_driver_sql("PRAGMA user_version").scalar() or 0)
+
+
+def _stamp(version: int) -> None:
+    with engine.connect() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+        conn.commit()
+
+
+def _lock_path() -> str:
+    database = engine.url.database or "sfo.db"
+    return f"{os.path.abspath(database)}.migrate.lock"
+
+
+@contextmanager
+def _migration_lock() -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    with open(_lock_path(), "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def run_migrations() -> dict:
+    """Apply pending migrations; returns what ran and how long the check took, in ms."""
+    started = time.perf_counter()
+    current = schema_version()
+    applied: list[int] = []
+    if current < LATEST_VERSION:
+        with _migration_lock():
+            # Another worker may have finished while this one waited for the lock.
+            current = schema_version()
+            for version, _name, step in MIGRATIONS:
+                if version <= current:
+                    continue
+                step()
+                _stamp(version)
+                applied.append(version)
+    return {
+        "version": max([current, *applied]),
+        "applied": applied,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+__all__ = ["MIGRATIONS", "LATEST_VERSION", "schema_version", "run_migrations"]
@@ -11,6 +11,7 @@ from sqlalchemy import (
     Enum as SAEnum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -131,6 +132,12 @@ class Project(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_bucket_status", "when_bucket", "status"),
+        Index("ix_tasks_status_completed", "status", "completed_at"),
+        Index("ix_tasks_resurface_on", "resurface_on"),
+        Index("ix_tasks_project", "project_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
@@ -155,6 +162,10 @@ class Task(Base):
 
 class Block(Base):
     __tablename__ = "blocks"
+    __table_args__ = (
+        Index("ix_blocks_date_start", "date", "start_time"),
+        Index("ix_blocks_project", "project_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=True)
@@ -200,6 +211,10 @@ class WaitingOn(Base):
 
 class RitualEntry(Base):
     __tablename__ = "ritual_entries"
+    __table_args__ = (
+        Index("ix_ritual_entries_date_type", "entry_date", "ritual_type"),
+        Index("ix_ritual_entries_type_created", "ritual_type", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ritual_type = Column(SAEnum(RitualType), nullable=False)
@@ -261,6 +276,7 @@ class HealthMetric(Base):
 
 class HealthEntry(Base):
     __tablename__ = "health_entries"
+    __table_args__ = (Index("ix_health_entries_metric_date", "metric_id", "entry_date"),)
 
     id = Column(Integer, primary_key=True, index=True)
     metric_id = Column(Integer, ForeignKey("health_metrics.id"), nullable=False)
@@ -290,6 +306,8 @@ class CoachConversation(Base):
     __tablename__ = "coach_conversations"
 
     id = Column(Integer, primary_key=True, index=True)
+    summary = Column(Text, nullable=True)  # rolling summary of turns older than the prompt tail
+    summary_through_id = Column(Integer, nullable=True)  # last CoachMessage.id folded into summary
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -300,20 +318,33 @@ class CoachConversation(Base):
 
 class CoachMessage(Base):
     __tablename__ = "coach_messages"
+    __table_args__ = (Index("ix_coach_messages_conversation", "conversation_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     conversation_id = Column(Integer, ForeignKey("coach_conversations.id"), nullable=False)
     role = Column(String(20), nullable=False)
     content = Column(Text, nullable=False)
-    context_json = Column(Text, nullable=True)
+    context_json = Column(Text, nullable=True)  # legacy inline context; new rows use context_id
+    context_id = Column(String(64), ForeignKey("coach_contexts.id"), nullable=True)
     actions_json = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     conversation = relationship("CoachConversation", back_populates="messages")
+    context = relationship("CoachContext")
+
+
+# Content-addressed screen context, shared by every message sent from the same page state.
+class CoachContext(Base):
+    __tablename__ = "coach_contexts"
+
+    id = Column(String(64), primary_key=True)  # sha256 of context_json
+    context_json = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 
 class GuidanceReminder(Base):
     __tablename__ = "guidance_reminders"
+    __table_args__ = (Index("ix_guidance_reminders_code_period", "code", "period_start"),)
 
     id = Column(Integer, primary_key=True, index=True)
     code = Column(String(64), nullable=False)
@@ -330,8 +361,30 @@ class GuidanceReminder(Base):
 
 class GuidanceEvent(Base):
     __tablename__ = "guidance_events"
+    __table_args__ = (Index("ix_guidance_events_code_created", "code", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     code = Column(String(64), nullable=False)
     context_json = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# Last parsed copy of an external calendar feed, so restarts can serve events before refetching.
+class CalendarFeedCache(Base):
+    __tablename__ = "calendar_feed_cache"
+
+    id = Column(String(64), primary_key=True)  # sha256 of the feed URL
+    body_hash = Column(String(64), nullable=True)
+    parse_key = Column(String(64), nullable=True)  # parser version and horizon of the events
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    events_json = Column(Text, nullable=False)
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+
+
+# Per-table change counters shared by every worker; see app.db.data_versions.
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import (
     Alignment,
     Block,
@@ -20,6 +20,7 @@ from ..models import (
     WhenBucket,
 )
 from ..security import require_api_auth
+from ..utils.calendar_feeds import calendar_feed_stats
 
 router = APIRouter(dependencies=[Depends(require_api_auth)])
 
@@ -96,7 +97,7 @@ def _enforce_weekly_cap(db: Session, category: ProjectCategory, make_active: boo
 
 # ---------- Project endpoints ----------
 @router.get("/projects")
-def list_projects(db: Session = Depends(get_db)):
+def list_projects(db: Session = Depends(get_read_db)):
     rows = db.query(Project).order_by(Project.created_at.desc()).all()
     return rows
 
@@ -141,7 +142,7 @@ def delete_project(project_id: int, db: Session = Depends(get_db)):
 
 # ---------- Task endpoints ----------
 @router.get("/tasks")
-def list_tasks(db: Session = Depends(get_db)):
+def list_tasks(db: Session = Depends(get_read_db)):
     rows = (
         db.query(Task)
         .order_by(Task.when_bucket.asc(), Task.priority.asc().nulls_last(), Task.created_at.desc())
@@ -182,3 +183,9 @@ def delete_task(task_id: int, db: Session = Depends(get_db)):
     db.delete(task)
     db.commit()
     return None
+
+
+# ---------- Calendar feed endpoints ----------
+@router.get("/calendar/feeds")
+def list_calendar_feeds():
+    return {"feeds": calendar_feed_stats()}
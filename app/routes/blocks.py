@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session, selectinload
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import Block, Task, Project
 from ..utils.rules import parse_block_type
 from ..utils.coach import build_coach_context_json, block_summary, task_summary, project_summary
@@ -13,7 +13,7 @@ router = APIRouter(dependencies=[Depends(require_html_auth), Depends(csrf_protec
 
 
 @router.get("/blocks", response_class=HTMLResponse)
-def blocks(request: Request, db: Session = Depends(get_db)):
+def blocks(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     blocks = (
         db.query(Block)
@@ -38,7 +38,6 @@ def blocks(request: Request, db: Session = Depends(get_db)):
             "projects": [project_summary(p) for p in projects],
             "ready_to_schedule": [task_summary(t) for t in sched_ready],
         },
-        db=db,
     )
     return templates.TemplateResponse(
         "blocks.html",
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import (
     Block,
     Project,
@@ -27,7 +27,7 @@ router = APIRouter(dependencies=[Depends(require_html_auth), Depends(csrf_protec
 
 
 @router.get("/capture", response_class=HTMLResponse)
-def capture(request: Request, db: Session = Depends(get_db)):
+def capture(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     projects = db.query(Project).order_by(Project.created_at.desc()).all()
     coach_context_json = build_coach_context_json(
@@ -35,7 +35,6 @@ def capture(request: Request, db: Session = Depends(get_db)):
         screen_id="capture",
         screen_title="Quick capture",
         screen_data={"projects": [project_summary(p) for p in projects]},
-        db=db,
     )
 
     return templates.TemplateResponse(
@@ -51,7 +50,7 @@ def capture(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/capture/wizard", response_class=HTMLResponse)
-def capture_wizard(request: Request, db: Session = Depends(get_db)):
+def capture_wizard(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     projects = db.query(Project).order_by(Project.created_at.desc()).all()
     prefill = request.query_params.get("prefill") or ""
@@ -60,7 +59,6 @@ def capture_wizard(request: Request, db: Session = Depends(get_db)):
         screen_id="capture_wizard",
         screen_title="Guided capture",
         screen_data={"projects": [project_summary(p) for p in projects]},
-        db=db,
     )
     return templates.TemplateResponse(
         "capture_wizard.html",
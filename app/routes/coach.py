@@ -1,15 +1,31 @@
+import hashlib
 import json
 import os
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
-from ..db import get_db
-from ..models import CoachConversation, CoachMessage
+from ..db import SessionLocal, get_async_db, get_async_read_db, get_db, run_db
+from ..models import CoachContext, CoachConversation, CoachMessage
 from ..security import csrf_protect, require_html_auth
-from ..utils.coach import generate_coach_reply
+from ..utils.coach import (
+    cached_global_context,
+    context_id_for,
+    generate_coach_reply,
+    global_context_snapshot,
+    load_history_tail,
+    persist_context,
+    recall_context,
+    refresh_conversation_summary,
+    screen_context_json,
+    stream_coach_reply,
+    suggest_quick_actions,
+)
 
 router = APIRouter(dependencies=[Depends(require_html_auth), Depends(csrf_protect)])
 
@@ -19,8 +35,12 @@ def _history_limit() -> int:
     return int(raw) if raw and raw.isdigit() else 120
 
 
+def _latest_conversation(db: Session) -> CoachConversation | None:
+    return db.query(CoachConversation).order_by(CoachConversation.created_at.desc()).first()
+
+
 def _get_or_create_conversation(db: Session) -> CoachConversation:
-    convo = db.query(CoachConversation).order_by(CoachConversation.created_at.desc()).first()
+    convo = _latest_conversation(db)
     if convo:
         return convo
     convo = CoachConversation()
@@ -45,9 +65,35 @@ def _message_payload(message: CoachMessage) -> dict:
     }
 
 
-@router.get("/coach/history")
-def coach_history(db: Session = Depends(get_db)):
-    convo = _get_or_create_conversation(db)
+def _resolve_context(db: Session, payload: dict) -> tuple[str | None, str | None]:
+    """Return (context_id, screen context JSON) for a message payload.
+
+    Clients normally send just the `context_id` issued when the page rendered; the issuing
+    worker stores it in coach_contexts shortly after. A full `screen_context` is still
+    accepted (older tabs, or a retry after a 409) and is stored with the exchange.
+    """
+    context = payload.get("screen_context")
+    if isinstance(context, dict) and context:
+        stored = screen_context_json(context)
+        return context_id_for(stored), stored
+
+    context_id = payload.get("context_id")
+    if not isinstance(context_id, str) or not context_id:
+        return None, None
+    stored = recall_context(context_id)
+    if stored is None:
+        row = db.get(CoachContext, context_id)
+        stored = row.context_json if row else None
+    if stored is None:
+        raise HTTPException(status_code=409, detail="Unknown context")
+    return context_id, stored
+
+
+def _history_messages(db: Session) -> tuple[int | None, list[dict]]:
+    # Read-only: a conversation is only created when the first message is sent.
+    convo = _latest_conversation(db)
+    if convo is None:
+        return None, []
     limit = _history_limit()
     messages = (
         db.query(CoachMessage)
@@ -56,8 +102,37 @@ def coach_history(db: Session = Depends(get_db)):
         .limit(limit)
         .all()
     )
-    messages = list(reversed(messages))
-    return JSONResponse({"messages": [_message_payload(m) for m in messages]})
+    return convo.id, [_message_payload(m) for m in reversed(messages)]
+
+
+@router.get("/coach/history")
+async def coach_history(db: Session | AsyncSession = Depends(get_async_read_db)):
+    conversation_id, messages = await run_db(db, _history_messages)
+    # Catch the summary up while the panel opens, so the next send replays only the tail.
+    background = BackgroundTask(refresh_conversation_summary, conversation_id) if conversation_id else None
+    return JSONResponse({"messages": messages}, background=background)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {item.strip().removeprefix("W/") for item in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+@router.get("/coach/context")
+async def coach_context(request: Request, screen: str = "", db: Session | AsyncSession = Depends(get_async_read_db)):
+    """Global lists for the coach panel, fetched when it opens instead of inlined in every page."""
+    screen_id = screen.strip()[:64]
+    lists_json, lists_etag = await run_db(db, global_context_snapshot)
+    digest = hashlib.sha1(f"{lists_etag}:{screen_id}".encode("utf-8")).hexdigest()
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    body = f'{{"screen": {json.dumps(screen_id, ensure_ascii=True)}, "lists": {lists_json}}}'
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/coach/clear")
@@ -68,8 +143,10 @@ def coach_clear(db: Session = Depends(get_db)):
     return JSONResponse({"ok": True})
 
 
-@router.post("/coach/message")
-async def coach_message(request: Request, db: Session = Depends(get_db)):
+async def _prepare_message(
+    request: Request, read_db: Session | AsyncSession, db: Session | AsyncSession
+) -> dict:
+    """Load what the reply needs on `read_db`; the writer `db` is only used to start a conversation."""
     try:
         payload = await request.json()
     except Exception:
@@ -78,33 +155,47 @@ async def coach_message(request: Request, db: Session = Depends(get_db)):
     message = (payload.get("message") or "").strip()
     if not message:
         raise HTTPException(status_code=400, detail="Message is required")
+    prepared = await run_db(read_db, _load_message_context, payload, message)
+    if prepared["conversation_id"] is None:
+        prepared["conversation_id"] = await run_db(db, _conversation_id)
+    return prepared
 
-    context = payload.get("screen_context")
-    if context is not None and not isinstance(context, dict):
-        context = None
 
-    convo = _get_or_create_conversation(db)
-    history = (
-        db.query(CoachMessage)
-        .filter(CoachMessage.conversation_id == convo.id)
-        .order_by(CoachMessage.id.asc())
-        .all()
-    )
+def _load_message_context(db: Session, payload: dict, message: str) -> dict:
+    context_id, stored_context = _resolve_context(db, payload)
+    context = None
+    if stored_context:
+        # Global lists come from the server-side snapshot instead of the request body.
+        context = {**json.loads(stored_context), "lists": cached_global_context(db)}
 
-    reply, actions, engine = generate_coach_reply(
-        message=message,
-        context=context,
-        history=history,
-    )
+    convo = _latest_conversation(db)
+    return {
+        "message": message,
+        "context": context,
+        "context_id": context_id,
+        "stored_context": stored_context,
+        "conversation_id": convo.id if convo else None,
+        "history": load_history_tail(db, convo) if convo else [],
+        "summary": convo.summary if convo else None,
+    }
 
-    context_json = json.dumps(context, ensure_ascii=True) if context else None
-    actions_json = json.dumps(actions, ensure_ascii=True) if actions else None
 
+def _conversation_id(db: Session) -> int:
+    return _get_or_create_conversation(db).id
+
+
+def _store_exchange(db: Session, prepared: dict, reply: str, actions: list[dict[str, str]]) -> None:
+    actions_json = json.dumps(actions, ensure_ascii=True) if actions else None
+    if prepared["context_id"]:
+        persist_context(db, prepared["context_id"], prepared["stored_context"])
+    convo = db.get(CoachConversation, prepared["conversation_id"])
+    if convo is None:
+        return
     user_msg = CoachMessage(
         conversation_id=convo.id,
         role="user",
-        content=message,
-        context_json=context_json,
+        content=prepared["message"],
+        context_id=prepared["context_id"],
     )
     assistant_msg = CoachMessage(
         conversation_id=convo.id,
@@ -116,4 +207,71 @@ async def coach_message(request: Request, db: Session = Depends(get_db)):
     db.add_all([user_msg, assistant_msg, convo])
     db.commit()
 
-    return JSONResponse({"reply": reply, "actions": actions, "engine": engine})
+
+def _store_exchange_in_new_session(prepared: dict, reply: str, actions: list[dict[str, str]]) -> None:
+    with SessionLocal() as session:
+        _store_exchange(session, prepared, reply, actions)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=True)}\n\n"
+
+
+@router.post("/coach/message")
+async def coach_message(
+    request: Request,
+    read_db: Session | AsyncSession = Depends(get_async_read_db),
+    db: Session | AsyncSession = Depends(get_async_db),
+):
+    prepared = await _prepare_message(request, read_db, db)
+    reply, actions, engine, meta = await generate_coach_reply(
+        message=prepared["message"],
+        context=prepared["context"],
+        history=prepared["history"],
+        summary=prepared["summary"],
+    )
+    await run_db(db, _store_exchange, prepared, reply, actions)
+    return JSONResponse(
+        {"reply": reply, "actions": actions, "engine": engine, "meta": meta},
+        background=BackgroundTask(refresh_conversation_summary, prepared["conversation_id"]),
+    )
+
+
+@router.post("/coach/message/stream")
+async def coach_message_stream(
+    request: Request,
+    read_db: Session | AsyncSession = Depends(get_async_read_db),
+    db: Session | AsyncSession = Depends(get_async_db),
+):
+    """Relay the reply as Server-Sent Events; the exchange is saved once the stream completes."""
+    prepared = await _prepare_message(request, read_db, db)
+    actions = suggest_quick_actions(prepared["context"])
+
+    async def events():
+        parts: list[str] = []
+        engine = "coach-lite"
+        meta: dict = {}
+        async for kind, value in stream_coach_reply(
+            message=prepared["message"],
+            context=prepared["context"],
+            history=prepared["history"],
+            summary=prepared["summary"],
+        ):
+            if kind == "delta":
+                parts.append(value)
+                yield _sse("delta", {"text": value})
+            elif kind == "meta":
+                meta = value
+            else:
+                engine = value
+        reply = "".join(parts).strip()
+        # The request-scoped session may already be closed once streaming starts.
+        await run_in_threadpool(_store_exchange_in_new_session, prepared, reply, actions)
+        yield _sse("done", {"actions": actions, "engine": engine, "meta": meta})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(refresh_conversation_summary, prepared["conversation_id"]),
+    )
@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy.orm import Session, selectinload
 
-from ..db import get_db
+from ..db import get_read_db
 from ..models import (
     Block,
     CoachMessage,
@@ -301,14 +301,13 @@ def _event_payload(events: list[GuidanceEvent]) -> list[dict]:
 
 
 @router.get("/export", response_class=HTMLResponse)
-def export_page(request: Request, db: Session = Depends(get_db)):
+def export_page(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     coach_context_json = build_coach_context_json(
         request_path=str(request.url.path),
         screen_id="export",
         screen_title="Export data",
         screen_data={},
-        db=db,
     )
     return templates.TemplateResponse(
         "export.html",
@@ -328,7 +327,7 @@ def export_data(
     include_health: str | None = Form(None),
     include_coach: str | None = Form(None),
     include_guidance: str | None = Form(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     start_date, end_date = _date_range(range_choice)
     start_dt, end_dt = _dt_bounds(start_date, end_date)
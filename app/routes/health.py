@@ -7,9 +7,12 @@ import re
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from starlette.concurrency import run_in_threadpool
 
-from ..db import get_db
+from ..db import get_async_read_db, get_db, run_db
 from ..models import (
     HealthEntry,
     HealthGoal,
@@ -123,10 +126,12 @@ def _recent_entries(
     categories: Iterable[HealthMetricCategory],
     limit: int = 14,
 ) -> list[HealthEntry]:
+    # Filter by metric id rather than joining, so the lookup rides ix_health_entries_metric_date.
+    metric_ids = select(HealthMetric.id).where(HealthMetric.category.in_(list(categories)))
     return (
         db.query(HealthEntry)
-        .join(HealthMetric, HealthEntry.metric_id == HealthMetric.id)
-        .filter(HealthMetric.category.in_(list(categories)))
+        .options(selectinload(HealthEntry.metric))
+        .filter(HealthEntry.metric_id.in_(metric_ids))
         .order_by(HealthEntry.entry_date.desc(), HealthEntry.created_at.desc())
         .limit(limit)
         .all()
@@ -286,21 +291,35 @@ def add_health_metric(
     return RedirectResponse(url=_safe_redirect(return_to), status_code=303)
 
 
-@router.get("/health", response_class=HTMLResponse)
-def health_dashboard(request: Request, db: Session = Depends(get_db)):
-    templates = request.app.state.templates
+def _load_health_dashboard(db: Session) -> dict:
     key_metrics = (
         db.query(HealthMetric)
         .filter(HealthMetric.is_key.is_(True))
         .order_by(HealthMetric.name.asc())
         .all()
     )
+    return {
+        "key_metrics": key_metrics,
+        "entries_by_metric": _fetch_entries(db, [metric.id for metric in key_metrics], limit=30),
+        "goals": (
+            db.query(HealthGoal)
+            .options(selectinload(HealthGoal.metric))
+            .order_by(HealthGoal.target_date.asc().nulls_last())
+            .all()
+        ),
+        "all_metrics": db.query(HealthMetric).order_by(HealthMetric.name.asc()).all(),
+    }
+
+
+def _render_health_dashboard(request: Request, rows: dict) -> HTMLResponse:
+    templates = request.app.state.templates
+    key_metrics = rows["key_metrics"]
     metric_ids = [metric.id for metric in key_metrics]
-    entries_by_metric = _fetch_entries(db, metric_ids, limit=30)
+    entries_by_metric = rows["entries_by_metric"]
     latest = _latest_entries(entries_by_metric)
     stats = _metric_stats(entries_by_metric)
-    goals = db.query(HealthGoal).order_by(HealthGoal.target_date.asc().nulls_last()).all()
-    all_metrics = db.query(HealthMetric).order_by(HealthMetric.name.asc()).all()
+    goals = rows["goals"]
+    all_metrics = rows["all_metrics"]
     entry_metrics = [
         metric for metric in all_metrics if metric.slug not in {"bp_systolic", "bp_diastolic"}
     ]
@@ -329,7 +348,6 @@ def health_dashboard(request: Request, db: Session = Depends(get_db)):
             ],
             "goals": [{"id": goal.id, "title": goal.title} for goal in goals],
         },
-        db=db,
     )
 
     return templates.TemplateResponse(
@@ -350,10 +368,24 @@ def health_dashboard(request: Request, db: Session = Depends(get_db)):
     )
 
 
-def _health_category_page(
+@router.get("/health", response_class=HTMLResponse)
+async def health_dashboard(request: Request, db: Session | AsyncSession = Depends(get_async_read_db)):
+    rows = await run_db(db, _load_health_dashboard)
+    return await run_in_threadpool(_render_health_dashboard, request, rows)
+
+
+def _load_health_category(
+    db: Session, categories: Iterable[HealthMetricCategory]
+) -> tuple[list[HealthMetric], dict[int, list[HealthEntry]], list[HealthEntry]]:
+    metrics = _category_metrics(db, categories)
+    entries_by_metric = _fetch_entries(db, [metric.id for metric in metrics], limit=30)
+    return metrics, entries_by_metric, _recent_entries(db, categories, limit=12)
+
+
+async def _health_category_page(
+    db: Session | AsyncSession,
     *,
     request: Request,
-    db: Session,
     screen_id: str,
     screen_title: str,
     active_tab: str,
@@ -361,15 +393,37 @@ def _health_category_page(
     template_name: str,
     exclude_entry_slugs: set[str] | None = None,
 ):
+    categories = list(categories)
+    rows = await run_db(db, _load_health_category, categories)
+    return await run_in_threadpool(
+        _render_health_category,
+        request,
+        rows,
+        screen_id=screen_id,
+        screen_title=screen_title,
+        active_tab=active_tab,
+        template_name=template_name,
+        exclude_entry_slugs=exclude_entry_slugs,
+    )
+
+
+def _render_health_category(
+    request: Request,
+    rows: tuple[list[HealthMetric], dict[int, list[HealthEntry]], list[HealthEntry]],
+    *,
+    screen_id: str,
+    screen_title: str,
+    active_tab: str,
+    template_name: str,
+    exclude_entry_slugs: set[str] | None,
+) -> HTMLResponse:
     templates = request.app.state.templates
-    metrics = _category_metrics(db, categories)
+    metrics, entries_by_metric, recent_entries = rows
     excluded = exclude_entry_slugs or set()
     entry_metrics = [metric for metric in metrics if metric.slug not in excluded]
     metric_ids = [metric.id for metric in metrics]
-    entries_by_metric = _fetch_entries(db, metric_ids, limit=30)
     latest = _latest_entries(entries_by_metric)
     stats = _metric_stats(entries_by_metric)
-    recent_entries = _recent_entries(db, categories, limit=12)
     series_payload = {
         str(metric_id): [
             {"date": entry.entry_date.isoformat(), "value": entry.value}
@@ -386,7 +440,6 @@ def _health_category_page(
             "metric_count": len(metrics),
             "recent_entries": len(recent_entries),
         },
-        db=db,
     )
 
     return templates.TemplateResponse(
@@ -407,10 +460,10 @@ def _health_category_page(
 
 
 @router.get("/health/diet", response_class=HTMLResponse)
-def health_diet(request: Request, db: Session = Depends(get_db)):
-    return _health_category_page(
+async def health_diet(request: Request, db: Session | AsyncSession = Depends(get_async_read_db)):
+    return await _health_category_page(
+        db,
         request=request,
-        db=db,
         screen_id="health_diet",
         screen_title="Diet planning",
         active_tab="diet",
@@ -420,10 +473,10 @@ def health_diet(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/health/weight", response_class=HTMLResponse)
-def health_weight(request: Request, db: Session = Depends(get_db)):
-    return _health_category_page(
+async def health_weight(request: Request, db: Session | AsyncSession = Depends(get_async_read_db)):
+    return await _health_category_page(
+        db,
         request=request,
-        db=db,
         screen_id="health_weight",
         screen_title="Weight and body composition",
         active_tab="weight",
@@ -434,10 +487,10 @@ def health_weight(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/health/fitness", response_class=HTMLResponse)
-def health_fitness(request: Request, db: Session = Depends(get_db)):
-    return _health_category_page(
+async def health_fitness(request: Request, db: Session | AsyncSession = Depends(get_async_read_db)):
+    return await _health_category_page(
+        db,
         request=request,
-        db=db,
         screen_id="health_fitness",
         screen_title="Fitness tracking",
         active_tab="fitness",
@@ -447,10 +500,10 @@ def health_fitness(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/health/strength", response_class=HTMLResponse)
-def health_strength(request: Request, db: Session = Depends(get_db)):
-    return _health_category_page(
+async def health_strength(request: Request, db: Session | AsyncSession = Depends(get_async_read_db)):
+    return await _health_category_page(
+        db,
         request=request,
-        db=db,
         screen_id="health_strength",
         screen_title="Strength tracking",
         active_tab="strength",
@@ -460,10 +513,10 @@ def health_strength(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/health/flexibility", response_class=HTMLResponse)
-def health_flexibility(request: Request, db: Session = Depends(get_db)):
-    return _health_category_page(
+async def health_flexibility(request: Request, db: Session | AsyncSession = Depends(get_async_read_db)):
+    return await _health_category_page(
+        db,
         request=request,
-        db=db,
         screen_id="health_flexibility",
         screen_title="Flexibility tracking",
         active_tab="flexibility",
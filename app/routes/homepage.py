@@ -1,16 +1,15 @@
-import os
-import ssl
-from datetime import date, datetime, time, timedelta
+import hashlib
+from datetime import date, datetime, timedelta
 from urllib.parse import quote_plus
-from urllib.request import Request as UrlRequest, urlopen
-import certifi
 
 from fastapi import APIRouter, Depends, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from sqlalchemy import and_, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
-from icalendar import Calendar
+from starlette.concurrency import run_in_threadpool
 
-from ..db import get_db
+from ..db import data_versions, get_async_read_db, get_db, run_db
 from ..models import (
     Project,
     ProjectStatus,
@@ -24,226 +23,107 @@ from ..models import (
 )
 from ..utils.rules import enforce_weekly_cap, compose_why_text, parse_block_type
 from ..utils.coach import build_coach_context_json, block_summary, task_summary
+from ..utils.calendar_feeds import merged_calendar, calendar_fetched_at, calendar_revision
+from ..utils.calendar_layout import CalendarItem, block_item, day_digest, feed_item, layout_day
 from ..utils.profile import get_profile
 from ..security import csrf_protect, require_html_auth
 
 router = APIRouter(dependencies=[Depends(require_html_auth), Depends(csrf_protect)])
-# in-memory cache of the parsed Cozi ICS feed
-_COZI_CACHE = {"fetched_at": None, "events": [], "status": "", "url": None}
-_COZI_CACHE_TTL_SECONDS = 60
 CALENDAR_START_HOUR = 6
 CALENDAR_END_HOUR = 23
 CALENDAR_HOURS = CALENDAR_END_HOUR - CALENDAR_START_HOUR
 CALENDAR_HOUR_HEIGHT_PX = 48
+INBOX_PAGE_SIZE = 20
+INBOX_BUCKETS = (WhenBucket.LATER, WhenBucket.MONTH, WhenBucket.QUARTER)
+OPEN_TASK_EXCLUDED = (TaskStatus.DONE, TaskStatus.ARCHIVED, TaskStatus.CANCELLED)
 
 
-def _split_cozi_label(label: str) -> tuple[str | None, str | None]:
-    if ":" not in label:
-        return None, None
-    prefix, remainder = label.split(":", 1)
-    prefix = prefix.strip()
-    remainder = remainder.strip()
-    if not prefix:
-        return None, None
-    return f"{prefix}:", remainder or None
-
-
-def _fetch_cozi_calendar() -> tuple[list[dict], str]:
-    """Fetch and cache Cozi ICS events (normalized) with a short TTL."""
-    url = os.getenv("COZI_ICS_URL")
-    if not url:
-        return [], "COZI_ICS_URL not set"
-
-    now = datetime.now().astimezone()  # cache timestamp in local tz
-    if (
-        _COZI_CACHE.get("url") == url
-        and _COZI_CACHE.get("fetched_at")
-        and (now - _COZI_CACHE["fetched_at"]).total_seconds() < _COZI_CACHE_TTL_SECONDS
-    ):
-        return _COZI_CACHE["events"], _COZI_CACHE.get("status", "")
-
-    events: list[dict] = []
-    try:
-        ssl_ctx = ssl.create_default_context(cafile=certifi.where())
-        req = UrlRequest(
-            url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (StartFinishing/0.2)",
-                "Accept": "text/calendar,*/*",
-            },
-        )
-        with urlopen(req, timeout=10, context=ssl_ctx) as resp:
-            data = resp.read()
-        cal = Calendar.from_ical(data)
-    except Exception as exc:
-        status = f"Cozi fetch failed: {exc}"
-        return _COZI_CACHE.get("events", []), status
-
-    for component in cal.walk("VEVENT"):
-        dtstart = component.get("dtstart")
-        if not dtstart:
-            continue
-        dtend = component.get("dtend")
-        summary = (component.get("summary") or "").strip() or "Cozi event"
-
-        start = dtstart.dt
-        end = dtend.dt if dtend else None
-        is_all_day = isinstance(start, date) and not isinstance(start, datetime)
-        if isinstance(end, date) and not isinstance(end, datetime):
-            is_all_day = True
-
-        if isinstance(start, date) and not isinstance(start, datetime):
-            start_dt = datetime.combine(start, time.min)
-        else:
-            start_dt = start
-
-        if isinstance(end, date) and not isinstance(end, datetime):
-            # iCal all-day events use an exclusive end date; subtract a tick for display logic.
-            end_dt = datetime.combine(end, time.min) - timedelta(seconds=1)
-        else:
-            end_dt = end
-
-        if isinstance(start_dt, datetime) and start_dt.tzinfo:
-            start_dt = start_dt.astimezone().replace(tzinfo=None)
-        if isinstance(end_dt, datetime) and end_dt and end_dt.tzinfo:
-            end_dt = end_dt.astimezone().replace(tzinfo=None)
-
-        if end_dt is None:
-            end_dt = start_dt + timedelta(hours=1)
-
-        label_prefix, label_suffix = _split_cozi_label(summary)
-        events.append(
-            {
-                "label": summary,
-                "label_prefix": label_prefix,
-                "label_suffix": label_suffix,
-                "start": start_dt,
-                "end": end_dt,
-                "is_all_day": is_all_day,
-            }
+def _inbox_page(db: Session, before_id: int | None = None) -> tuple[list[Task], int | None]:
+    """One page of open inbox tasks, newest first, and the id to continue from (None at the end).
+
+    Keyset paging on (created_at, id) keeps each page a bounded index range scan however
+    long the inbox grows.
+    """
+    query = (
+        db.query(Task)
+        .options(selectinload(Task.project))
+        .filter(Task.when_bucket.in_(INBOX_BUCKETS), Task.status.notin_(OPEN_TASK_EXCLUDED))
+    )
+    if before_id is not None:
+        cursor = db.get(Task, before_id)
+        if cursor is None:
+            return [], None
+        query = query.filter(
+            or_(
+                Task.created_at < cursor.created_at,
+                and_(Task.created_at == cursor.created_at, Task.id < cursor.id),
+            )
         )
+    rows = query.order_by(Task.created_at.desc(), Task.id.desc()).limit(INBOX_PAGE_SIZE + 1).all()
+    if len(rows) > INBOX_PAGE_SIZE:
+        return rows[:INBOX_PAGE_SIZE], rows[INBOX_PAGE_SIZE - 1].id
+    return rows, None
 
-    _COZI_CACHE["fetched_at"] = now
-    _COZI_CACHE["events"] = events
-    _COZI_CACHE["status"] = f"OK ({len(events)} events)"
-    _COZI_CACHE["url"] = url
-    return events, _COZI_CACHE["status"]
 
+def _blocks_between(db: Session, first: date, last: date) -> list[Block]:
+    return (
+        db.query(Block)
+        .options(selectinload(Block.project))
+        .filter(Block.date >= first, Block.date <= last)
+        .order_by(Block.date.asc(), Block.start_time.asc().nulls_last())
+        .all()
+    )
 
-def _cozi_events_touching_day(events: list[dict], target_date: date) -> list[dict]:
-    return [ev for ev in events if ev["start"].date() <= target_date <= ev["end"].date()]
 
+def _calendar_version(db: Session, view: str, today: date) -> str:
+    """Changes whenever the events a calendar view draws could have changed.
 
-def _fetch_cozi_events(target_date: date) -> tuple[list[dict], str]:
-    events, status = _fetch_cozi_calendar()
-    return _cozi_events_touching_day(events, target_date), status
+    Feed status and refresh times are left out: they move on every revalidation, even a
+    304, and are sent alongside each poll response instead.
+    """
+    raw = ":".join(
+        str(part)
+        for part in (
+            view,
+            today.isoformat(),
+            data_versions(db, "blocks", "projects"),
+            calendar_revision(),
+        )
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _calendar_meta(view: str, external_by_day: dict[date, list[dict]]) -> str:
+    count = len({id(ev) for day_events in external_by_day.values() for ev in day_events})
+    fetched_at = calendar_fetched_at()
+    updated = fetched_at.astimezone().strftime("%d %b %I:%M %p") if fetched_at else "—"
+    span = "this week" if view == "week" else "today"
+    return f"Calendars: {count} {span} · Updated {updated}"
+
+
+def _day_items(blocks: list[Block], external_events: list[dict], day: date) -> list[CalendarItem]:
+    items = [item for item in map(block_item, blocks) if item is not None]
+    items.extend(feed_item(ev, day, CALENDAR_START_HOUR * 60) for ev in external_events)
+    return layout_day(items, CALENDAR_START_HOUR * 60, CALENDAR_HOURS * 60)
 
 
 def _build_week_calendar(
     *,
     week_start: date,
-    day_start_minutes: float,
-    day_total_minutes: float,
     blocks: list[Block],
-    cozi_events: list[dict],
+    external_by_day: dict[date, list[dict]],
     today: date,
+    days: int = 7,
 ) -> list[dict]:
-    week_end = week_start + timedelta(days=6)
-    week_days = [week_start + timedelta(days=offset) for offset in range(7)]
+    week_days = [week_start + timedelta(days=offset) for offset in range(days)]
 
     blocks_by_day: dict[date, list[Block]] = {d: [] for d in week_days}
     for b in blocks:
         if b.date in blocks_by_day:
             blocks_by_day[b.date].append(b)
 
-    cozi_by_day: dict[date, list[dict]] = {d: [] for d in week_days}
-    for ev in cozi_events:
-        ev_start = ev["start"].date()
-        ev_end = ev["end"].date()
-        if ev_end < week_start or ev_start > week_end:
-            continue
-        cur = max(ev_start, week_start)
-        last = min(ev_end, week_end)
-        while cur <= last:
-            cozi_by_day[cur].append(ev)
-            cur += timedelta(days=1)
-
     week_calendar = []
-    window_start = day_start_minutes
-    window_end = day_start_minutes + day_total_minutes
     for d in week_days:
-        day_events = []
-        for b in sorted(blocks_by_day[d], key=lambda block: block.start_time or time.max):
-            if not b.start_time:
-                continue
-            label = b.title or b.block_type.value.title()
-            start_min = b.start_time.hour * 60 + b.start_time.minute
-            end_min = (
-                b.end_time.hour * 60 + b.end_time.minute if b.end_time else start_min + 30
-            )
-            top_pct = max(0, (start_min - day_start_minutes) / day_total_minutes * 100)
-            height_pct = max(5, (end_min - start_min) / day_total_minutes * 100)
-            day_events.append(
-                {
-                    "label": label,
-                    "title": b.title,
-                    "block_id": b.id,
-                    "project": b.project.title if b.project else None,
-                    "top": top_pct,
-                    "height": height_pct,
-                    "start_display": b.start_time.strftime("%-I:%M %p"),
-                    "end_display": b.end_time.strftime("%-I:%M %p") if b.end_time else "",
-                    "type": b.block_type.value,
-                }
-            )
-
-        for ev in cozi_by_day[d]:
-            start_dt = ev["start"]
-            end_dt = ev["end"]
-            is_all_day = bool(ev.get("is_all_day"))
-            if is_all_day:
-                start_min = window_start
-                end_min = min(window_start + 60, window_end)
-                start_display = "All Day event"
-                end_display = ""
-            else:
-                start_min = start_dt.hour * 60 + start_dt.minute
-                end_min = end_dt.hour * 60 + end_dt.minute
-                start_display = start_dt.strftime("%-I:%M %p")
-                end_display = end_dt.strftime("%-I:%M %p")
-                if d > start_dt.date():
-                    start_min = 0
-                    start_display = "12:00 AM"
-                if d < end_dt.date():
-                    end_min = 24 * 60
-                    end_display = "11:59 PM"
-            effective_start = max(window_start, start_min)
-            effective_end = min(window_end, end_min)
-            if effective_end <= window_start or effective_start >= window_end:
-                continue
-            top_pct = max(0, (effective_start - window_start) / day_total_minutes * 100)
-            height_pct = max(5, (effective_end - effective_start) / day_total_minutes * 100)
-            name_prefix = (ev["label"] or "").lower()
-            extra_class = "event-block--all-day" if is_all_day else None
-            if name_prefix.startswith("brynlee"):
-                extra_class = f"{extra_class} cozi-brynlee" if extra_class else "cozi-brynlee"
-            elif name_prefix.startswith("jessica"):
-                extra_class = f"{extra_class} cozi-jessica" if extra_class else "cozi-jessica"
-            day_events.append(
-                {
-                    "label": ev["label"],
-                    "label_prefix": ev.get("label_prefix"),
-                    "label_suffix": ev.get("label_suffix"),
-                    "project": None,
-                    "top": top_pct,
-                    "height": height_pct,
-                    "start_display": start_display,
-                    "end_display": end_display,
-                    "type": "external",
-                    "extra_class": extra_class,
-                }
-            )
-
         week_calendar.append(
             {
                 "date": d,
@@ -251,84 +131,32 @@ def _build_week_calendar(
                 "weekday": d.strftime("%a"),
                 "label": f"{d.strftime('%b')} {d.day}",
                 "is_today": d == today,
-                "events": sorted(day_events, key=lambda item: item.get("top", 0)),
+                "events": _day_items(blocks_by_day[d], external_by_day.get(d, []), d),
             }
         )
+        week_calendar[-1]["digest"] = day_digest(week_calendar[-1]["events"])
 
     return week_calendar
 
 
-def _calendar_event_context(events: list[dict]) -> list[dict]:
-    context = []
-    for ev in events:
-        context.append(
-            {
-                "label": ev.get("label"),
-                "start": ev.get("start_display"),
-                "end": ev.get("end_display"),
-                "type": ev.get("type"),
-                "project": ev.get("project"),
-                "block_id": ev.get("block_id"),
-            }
-        )
-    return context
-
-
-@router.get("/", response_class=HTMLResponse)
-def landing(request: Request, db: Session = Depends(get_db)):
-    templates = request.app.state.templates
-
-    today = date.today()
-    now = datetime.now().time()
-    now_minutes = datetime.now().hour * 60 + datetime.now().minute
-    projects = (
-        db.query(Project)
-        .filter(Project.status != ProjectStatus.ARCHIVED)
-        .order_by(Project.active_this_week.desc(), Project.created_at.desc())
-        .all()
-    )
+def _load_landing(db: Session, today: date) -> dict:
+    """Every row the home page shows; the page is rendered from these after the session closes."""
     today_tasks = (
         db.query(Task)
         .options(selectinload(Task.project))
         .filter(
             Task.when_bucket == WhenBucket.TODAY,
-            Task.status.notin_([TaskStatus.DONE, TaskStatus.ARCHIVED, TaskStatus.CANCELLED]),
+            Task.status.notin_(OPEN_TASK_EXCLUDED),
         )
         .order_by(Task.block_type.asc().nulls_last(), Task.priority.asc().nulls_last())
         .all()
     )
-    inbox_tasks = (
-        db.query(Task)
-        .options(selectinload(Task.project))
-        .filter(
-            Task.when_bucket.in_([WhenBucket.LATER, WhenBucket.MONTH, WhenBucket.QUARTER]),
-            Task.status.notin_([TaskStatus.DONE, TaskStatus.ARCHIVED, TaskStatus.CANCELLED]),
-        )
-        .order_by(Task.created_at.desc())
-        .all()
-    )
-    week_blocks = (
-        db.query(Block)
-        .options(selectinload(Block.project))
-        .order_by(Block.date.asc(), Block.start_time.asc().nulls_last())
-        .all()
-    )
-
+    inbox_tasks, inbox_next = _inbox_page(db)
     # Soft enforcement snapshot for the 4 work + 3 personal rule
-    weekly_work = [p for p in projects if p.active_this_week and p.category == ProjectCategory.WORK]
-    weekly_personal = [
-        p for p in projects if p.active_this_week and p.category == ProjectCategory.PERSONAL
-    ]
-    sched_ready = (
-        db.query(Task)
-        .options(selectinload(Task.project))
-        .filter(
-            Task.block_type.isnot(None),
-            Task.duration_minutes.isnot(None),
-            Task.scheduled_for.is_(None),
-            Task.status.notin_([TaskStatus.DONE, TaskStatus.ARCHIVED, TaskStatus.CANCELLED]),
-        )
-        .order_by(Task.when_bucket.asc(), Task.created_at.desc())
+    weekly_counts = dict(
+        db.query(Project.category, func.count(Project.id))
+        .filter(Project.status != ProjectStatus.ARCHIVED, Project.active_this_week.is_(True))
+        .group_by(Project.category)
         .all()
     )
     ritual_entries = (
@@ -337,6 +165,28 @@ def landing(request: Request, db: Session = Depends(get_db)):
         .order_by(RitualEntry.created_at.desc())
         .all()
     )
+    return {
+        "today_tasks": today_tasks,
+        "inbox_tasks": inbox_tasks,
+        "inbox_next": inbox_next,
+        "todays_blocks": _blocks_between(db, today, today),
+        "weekly_counts": weekly_counts,
+        "ritual_entries": ritual_entries,
+        "profile": get_profile(db),
+        "calendar_version": _calendar_version(db, "day", today),
+    }
+
+
+def _render_landing(request: Request, calendar, today: date, rows: dict) -> HTMLResponse:
+    templates = request.app.state.templates
+
+    now = datetime.now().time()
+    now_minutes = datetime.now().hour * 60 + datetime.now().minute
+    today_tasks = rows["today_tasks"]
+    inbox_tasks, inbox_next = rows["inbox_tasks"], rows["inbox_next"]
+    todays_blocks = rows["todays_blocks"]
+    weekly_counts = rows["weekly_counts"]
+    ritual_entries = rows["ritual_entries"]
     ritual_by_type: dict[str, RitualEntry] = {}
     for entry in ritual_entries:
         key = entry.ritual_type.value if isinstance(entry.ritual_type, RitualType) else str(entry.ritual_type)
@@ -372,26 +222,21 @@ def landing(request: Request, db: Session = Depends(get_db)):
                 ritual_next_key = key
                 break
     ritual_next_label = ritual_labels.get(ritual_next_key) if ritual_next_key else None
-    profile = get_profile(db)
+    profile = rows["profile"]
     profile_why = profile.why_primary if profile else None
     profile_missing = profile is None or not profile.why_primary
     morning_entry = ritual_by_type.get("morning")
     today_one_thing = morning_entry.one_thing if morning_entry else None
     today_frog = morning_entry.frog if morning_entry else None
-    todays_blocks = [b for b in week_blocks if b.date == today]
-    cozi_all_events, cozi_status = _fetch_cozi_calendar()
-    cozi_events_today = _cozi_events_touching_day(cozi_all_events, today)
-    cozi_last_updated = None
-    if _COZI_CACHE.get("fetched_at"):
-        local_dt = _COZI_CACHE["fetched_at"].astimezone()
-        cozi_last_updated = local_dt.strftime("%d %b %I:%M %p")
-    cozi_error = None if cozi_status.startswith("OK") else cozi_status
+    external_index, feed_status = calendar
+    calendar_version = rows["calendar_version"]
+    external_events_today = external_index.on_day(today)
+    feed_error = None if feed_status.startswith("OK") else feed_status
     # Determine current block based on time if start/end present
     current_block = None
     upcoming_blocks = []
     timeline_events = []
     now_action = None
-    calendar_events = []
     # Timeline window used for percentage positioning (hour rows are 48px tall in CSS)
     day_start_minutes = CALENDAR_START_HOUR * 60
     day_total_minutes = CALENDAR_HOURS * 60
@@ -401,7 +246,7 @@ def landing(request: Request, db: Session = Depends(get_db)):
         now_position = max(
             0, min(100, (now_minutes - day_start_minutes) / day_total_minutes * 100)
         )
-        now_label = datetime.now().strftime("%-I:%M %p")
+        now_label = datetime.now().strftime("%I:%M %p").lstrip("0")
     for b in todays_blocks:
         if b.start_time and b.end_time and b.start_time <= now <= b.end_time:
             current_block = b
@@ -421,80 +266,7 @@ def landing(request: Request, db: Session = Depends(get_db)):
                 "project": b.project.title if b.project else None,
             }
         )
-        if b.start_time:
-            label = b.title or b.block_type.value.title()
-            start_min = b.start_time.hour * 60 + b.start_time.minute
-            end_min = (
-                b.end_time.hour * 60 + b.end_time.minute
-                if b.end_time
-                else start_min + 30
-            )
-            top_pct = max(0, (start_min - day_start_minutes) / day_total_minutes * 100)
-            height_pct = max(5, (end_min - start_min) / day_total_minutes * 100)
-            calendar_events.append(
-                {
-                    "label": label,
-                    "title": b.title,
-                    "block_id": b.id,
-                    "project": b.project.title if b.project else None,
-                    "top": top_pct,
-                    "height": height_pct,
-                    "start_display": b.start_time.strftime("%-I:%M %p"),
-                    "end_display": b.end_time.strftime("%-I:%M %p") if b.end_time else "",
-                    "type": b.block_type.value,
-                }
-            )
-
-    for ev in cozi_events_today:
-        start_dt = ev["start"]
-        end_dt = ev["end"]
-        is_all_day = bool(ev.get("is_all_day"))
-        if is_all_day:
-            start_min = day_start_minutes
-            end_min = min(day_start_minutes + 60, day_start_minutes + day_total_minutes)
-            start_display = "All Day event"
-            end_display = ""
-        else:
-            start_min = start_dt.hour * 60 + start_dt.minute
-            end_min = end_dt.hour * 60 + end_dt.minute
-            start_display = start_dt.strftime("%-I:%M %p")
-            end_display = end_dt.strftime("%-I:%M %p")
-            if today > start_dt.date():
-                start_min = 0
-                start_display = "12:00 AM"
-            if today < end_dt.date():
-                end_min = 24 * 60
-                end_display = "11:59 PM"
-        window_start = day_start_minutes
-        window_end = day_start_minutes + day_total_minutes
-        effective_start = max(window_start, start_min)
-        effective_end = min(window_end, end_min)
-        if effective_end <= window_start or effective_start >= window_end:
-            continue
-        top_pct = max(0, (effective_start - window_start) / day_total_minutes * 100)
-        height_pct = max(5, (effective_end - effective_start) / day_total_minutes * 100)
-        # Color-code Cozi events by label prefix if desired (e.g., Brynlee/Jessica)
-        name_prefix = (ev["label"] or "").lower()
-        extra_class = "event-block--all-day" if is_all_day else None
-        if name_prefix.startswith("brynlee"):
-            extra_class = f"{extra_class} cozi-brynlee" if extra_class else "cozi-brynlee"
-        elif name_prefix.startswith("jessica"):
-            extra_class = f"{extra_class} cozi-jessica" if extra_class else "cozi-jessica"
-
-        calendar_events.append(
-            {
-                "label": ev["label"],
-                "label_prefix": ev.get("label_prefix"),
-                "label_suffix": ev.get("label_suffix"),
-                "project": None,
-                "top": top_pct,
-                "height": height_pct,
-                "start_display": start_display,
-                "end_display": end_display,
-                "type": "external",
-                "extra_class": extra_class,
-            }
-        )
+    calendar_events = _day_items(todays_blocks, external_events_today, today)
     upcoming_blocks = sorted(upcoming_blocks, key=lambda x: (x.start_time or datetime.max.time()))
     coach_context_json = build_coach_context_json(
         request_path=str(request.url.path),
@@ -507,45 +279,43 @@ def landing(request: Request, db: Session = Depends(get_db)):
             "inbox_tasks": [task_summary(t) for t in inbox_tasks],
             "current_block": block_summary(current_block) if current_block else None,
             "upcoming_blocks": [block_summary(b) for b in upcoming_blocks],
-            "calendar_events": _calendar_event_context(calendar_events),
-            "cozi_status": cozi_status,
-            "cozi_event_count": len(cozi_events_today),
-            "cozi_error": cozi_error,
+            "calendar_events": [item.summary() for item in calendar_events],
+            "feed_status": feed_status,
+            "feed_event_count": len(external_events_today),
+            "feed_error": feed_error,
             "why_primary": profile_why,
             "one_thing": today_one_thing,
             "frog": today_frog,
         },
-        db=db,
     )
 
     return templates.TemplateResponse(
         "home.html",
         {
             "request": request,
-            "projects": projects,
             "today_tasks": today_tasks,
             "inbox_tasks": inbox_tasks,
-            "week_blocks": week_blocks,
+            "inbox_next": inbox_next,
             "todays_blocks": todays_blocks,
             "current_block": current_block,
             "upcoming_blocks": upcoming_blocks,
             "timeline_events": sorted(timeline_events, key=lambda e: e["start"] or datetime.max.time()),
             "calendar_events": calendar_events,
-            "cozi_event_count": len(cozi_events_today),
-            "cozi_status": cozi_status,
-            "cozi_last_updated": cozi_last_updated,
+            "calendar_digest": day_digest(calendar_events),
+            "calendar_version": calendar_version,
+            "calendar_meta": _calendar_meta("day", {today: external_events_today}),
+            "feed_status": feed_status,
             "server_today": today,
             "now_position": now_position,
             "now_label": now_label,
             "day_start_minutes": day_start_minutes,
             "day_total_minutes": day_total_minutes,
             "now_action": now_action,
-            "weekly_work_count": len(weekly_work),
-            "weekly_personal_count": len(weekly_personal),
+            "weekly_work_count": weekly_counts.get(ProjectCategory.WORK, 0),
+            "weekly_personal_count": weekly_counts.get(ProjectCategory.PERSONAL, 0),
             "form_error": request.query_params.get("error"),
             "form_success": request.query_params.get("success"),
-            "sched_ready": sched_ready,
-            "cozi_error": cozi_error,
+            "feed_error": feed_error,
             "calendar_start_hour": CALENDAR_START_HOUR,
             "calendar_end_hour": CALENDAR_END_HOUR,
             "calendar_hours": CALENDAR_HOURS,
@@ -563,66 +333,63 @@ def landing(request: Request, db: Session = Depends(get_db)):
     )
 
 
-@router.get("/calendar/week", response_class=HTMLResponse)
-def week_calendar_screen(request: Request, db: Session = Depends(get_db)):
+@router.get("/", response_class=HTMLResponse)
+async def landing(request: Request, db: Session | AsyncSession = Depends(get_async_read_db)):
+    # The merge may wait on a cold feed, so it stays in the threadpool on either path.
+    calendar = await run_in_threadpool(merged_calendar)
+    today = date.today()
+    rows = await run_db(db, _load_landing, today)
+    return await run_in_threadpool(_render_landing, request, calendar, today, rows)
+
+
+def _render_inbox_more(request: Request, page: tuple[list[Task], int | None]) -> HTMLResponse:
+    templates = request.app.state.templates
+    inbox_tasks, inbox_next = page
+    return templates.TemplateResponse(
+        "partials/inbox_items.html",
+        {"request": request, "inbox_tasks": inbox_tasks, "inbox_next": inbox_next},
+    )
+
+
+@router.get("/inbox/more", response_class=HTMLResponse)
+async def inbox_more(request: Request, before: int, db: Session | AsyncSession = Depends(get_async_read_db)):
+    """Next page of the home inbox, rendered as list items for the "Load more" button."""
+    page = await run_db(db, _inbox_page, before)
+    return await run_in_threadpool(_render_inbox_more, request, page)
+
+
+def _load_week_calendar(db: Session, today: date) -> tuple[str, list[Block]]:
+    return _calendar_version(db, "week", today), _blocks_between(db, today, today + timedelta(days=6))
+
+
+def _render_week_calendar(
+    request: Request, calendar, today: date, calendar_version: str, week_blocks: list[Block]
+) -> HTMLResponse:
     templates = request.app.state.templates
 
-    today = date.today()
     week_start = today
     week_end = week_start + timedelta(days=6)
 
-    week_blocks = (
-        db.query(Block)
-        .options(selectinload(Block.project))
-        .filter(Block.date >= week_start, Block.date <= week_end)
-        .order_by(Block.date.asc(), Block.start_time.asc().nulls_last())
-        .all()
-    )
+    external_index, feed_status = calendar
+    feed_error = None if feed_status.startswith("OK") else feed_status
+    external_by_day = external_index.by_day(week_start, week_end)
+    feed_week_event_count = len({id(ev) for day_events in external_by_day.values() for ev in day_events})
 
-    cozi_all_events, cozi_status = _fetch_cozi_calendar()
-    cozi_last_updated = None
-    if _COZI_CACHE.get("fetched_at"):
-        local_dt = _COZI_CACHE["fetched_at"].astimezone()
-        cozi_last_updated = local_dt.strftime("%d %b %I:%M %p")
-    cozi_error = None if cozi_status.startswith("OK") else cozi_status
-    cozi_week_event_count = len(
-        [
-            ev
-            for ev in cozi_all_events
-            if ev["end"].date() >= week_start and ev["start"].date() <= week_end
-        ]
-    )
-
-    day_start_minutes = CALENDAR_START_HOUR * 60
-    day_total_minutes = CALENDAR_HOURS * 60
     week_calendar = _build_week_calendar(
         week_start=week_start,
-        day_start_minutes=day_start_minutes,
-        day_total_minutes=day_total_minutes,
         blocks=week_blocks,
-        cozi_events=cozi_all_events,
+        external_by_day=external_by_day,
         today=today,
     )
     week_context = []
     for day in week_calendar:
-        events = []
-        for ev in day.get("events", []):
-            events.append(
-                {
-                    "label": ev.get("label"),
-                    "start": ev.get("start_display"),
-                    "end": ev.get("end_display"),
-                    "type": ev.get("type"),
-                    "project": ev.get("project"),
-                }
-            )
         week_context.append(
             {
                 "date": day.get("iso"),
                 "weekday": day.get("weekday"),
                 "label": day.get("label"),
                 "is_today": day.get("is_today"),
-                "events": events,
+                "events": [item.summary() for item in day["events"]],
             }
         )
     coach_context_json = build_coach_context_json(
@@ -633,11 +400,10 @@ def week_calendar_screen(request: Request, db: Session = Depends(get_db)):
             "week_start": week_start.isoformat(),
             "week_end": week_end.isoformat(),
             "calendar": week_context,
-            "cozi_status": cozi_status,
-            "cozi_event_count": cozi_week_event_count,
-            "cozi_error": cozi_error,
+            "feed_status": feed_status,
+            "feed_event_count": feed_week_event_count,
+            "feed_error": feed_error,
         },
-        db=db,
     )
 
     return templates.TemplateResponse(
@@ -645,9 +411,9 @@ def week_calendar_screen(request: Request, db: Session = Depends(get_db)):
         {
             "request": request,
             "week_calendar": week_calendar,
-            "cozi_week_event_count": cozi_week_event_count,
-            "cozi_last_updated": cozi_last_updated,
-            "cozi_error": cozi_error,
+            "calendar_version": calendar_version,
+            "calendar_meta": _calendar_meta("week", external_by_day),
+            "feed_error": feed_error,
             "calendar_start_hour": CALENDAR_START_HOUR,
             "calendar_end_hour": CALENDAR_END_HOUR,
             "calendar_hours": CALENDAR_HOURS,
@@ -657,6 +423,77 @@ def week_calendar_screen(request: Request, db: Session = Depends(get_db)):
     )
 
 
+@router.get("/calendar/week", response_class=HTMLResponse)
+async def week_calendar_screen(request: Request, db: Session | AsyncSession = Depends(get_async_read_db)):
+    calendar = await run_in_threadpool(merged_calendar)
+    today = date.today()
+    calendar_version, week_blocks = await run_db(db, _load_week_calendar, today)
+    return await run_in_threadpool(_render_week_calendar, request, calendar, today, calendar_version, week_blocks)
+
+
+def _load_calendar_changes(db: Session, view: str, today: date, since: str) -> tuple[str, list[Block] | None]:
+    """Return the view's version and, unless it equals `since`, the blocks it draws."""
+    # Read the version before querying so a concurrent commit leaves the client stale, not wrong.
+    version = _calendar_version(db, view, today)
+    if since == version:
+        return version, None
+    last = today + timedelta(days=6) if view == "week" else today
+    return version, _blocks_between(db, today, last)
+
+
+def _render_calendar_days(
+    request: Request, view: str, today: date, blocks: list[Block], external_by_day
+) -> list[dict]:
+    last = today + timedelta(days=6) if view == "week" else today
+    week_calendar = _build_week_calendar(
+        week_start=today,
+        blocks=blocks,
+        external_by_day=external_by_day,
+        today=today,
+        days=(last - today).days + 1,
+    )
+    partial = request.app.state.templates.get_template("partials/calendar_events.html")
+    return [
+        {
+            "iso": day["iso"],
+            "digest": day["digest"],
+            "html": partial.render(events=day["events"], mini=view == "week", request=request),
+        }
+        for day in week_calendar
+    ]
+
+
+@router.get("/calendar/changes")
+async def calendar_changes(
+    request: Request,
+    view: str = "day",
+    since: str = "",
+    db: Session | AsyncSession = Depends(get_async_read_db),
+):
+    """What a calendar view needs to repaint since version `since`, for its once-a-minute poll.
+
+    An unchanged view costs one data-version read, with no block query and no rendering; only
+    the status line (meta and feed error) comes back. Otherwise every day column comes back
+    with its digest and HTML, and the client swaps only the columns whose digest moved. The
+    now-line is already moved client-side every second.
+    """
+    view = "week" if view == "week" else "day"
+    today = date.today()
+    external_index, feed_status = await run_in_threadpool(merged_calendar)
+    last = today + timedelta(days=6) if view == "week" else today
+    # The index caches expanded windows, so this stays cheap on an unchanged poll.
+    external_by_day = external_index.by_day(today, last)
+    status = {
+        "meta": _calendar_meta(view, external_by_day),
+        "error": None if feed_status.startswith("OK") else feed_status,
+    }
+    version, blocks = await run_db(db, _load_calendar_changes, view, today, since)
+    if blocks is None:
+        return JSONResponse({"version": version, "changed": False, **status})
+    days = await run_in_threadpool(_render_calendar_days, request, view, today, blocks, external_by_day)
+    return JSONResponse({"version": version, "changed": True, "days": days, **status})
+
+
 @router.post("/projects/form")
 def create_project(
     title: str = Form(...),
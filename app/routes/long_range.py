@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from sqlalchemy.orm import Session, selectinload
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import Project, ProjectStatus, ProjectCategory, ProjectSize, SuccessLevel, SuccessPack
 from ..security import csrf_protect, require_html_auth
 from ..utils.coach import build_coach_context_json, project_summary
@@ -110,7 +110,6 @@ def _build_long_range_context(
             "horizon_counts": {key: len(values) for key, values in horizons.items()},
             "roadmap_projects": [project_summary(project) for project in roadmap_projects],
         },
-        db=db,
     )
 
     return {
@@ -235,7 +234,7 @@ def long_range_redirect():
 
 
 @router.get("/long-term", response_class=HTMLResponse)
-def long_range_horizons(request: Request, db: Session = Depends(get_db)):
+def long_range_horizons(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     context = _build_long_range_context(
         request=request,
@@ -251,7 +250,7 @@ def long_range_horizons(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/long-term/pyramid", response_class=HTMLResponse)
-def long_range_pyramid(request: Request, db: Session = Depends(get_db)):
+def long_range_pyramid(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     context = _build_long_range_context(
         request=request,
@@ -267,7 +266,7 @@ def long_range_pyramid(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/long-term/roadmaps", response_class=HTMLResponse)
-def long_range_roadmaps(request: Request, db: Session = Depends(get_db)):
+def long_range_roadmaps(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     context = _build_long_range_context(
         request=request,
@@ -4,9 +4,10 @@ from datetime import date, datetime, time, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..db import get_db
+from ..db import get_async_db, get_db, run_db
 from ..models import GuidanceEvent, GuidanceReminder, Project, ProjectStatus, RitualEntry, WaitingOn
 from ..security import csrf_protect, require_html_auth
 
@@ -162,8 +163,7 @@ REMINDER_DEFS = [
 ]
 
 
-@router.get("/nudges")
-def list_nudges(db: Session = Depends(get_db)):
+def _due_nudges(db: Session) -> list[dict]:
     today = date.today()
     now = datetime.utcnow()
     reminders: list[GuidanceReminder] = []
@@ -238,8 +238,12 @@ def list_nudges(db: Session = Depends(get_db)):
                 "link_url": definition.get("link_url") if definition else None,
             }
         )
+    return payload
+
 
-    return JSONResponse({"nudges": payload})
+@router.get("/nudges")
+async def list_nudges(db: Session | AsyncSession = Depends(get_async_db)):
+    return JSONResponse({"nudges": await run_db(db, _due_nudges)})
 
 
 @router.post("/nudges/{reminder_id}/complete")
@@ -256,11 +260,19 @@ def complete_nudge(reminder_id: int, db: Session = Depends(get_db)):
     return JSONResponse({"ok": True})
 
 
-@router.post("/nudges/{reminder_id}/snooze")
-async def snooze_nudge(reminder_id: int, request: Request, db: Session = Depends(get_db)):
+def _snooze(db: Session, reminder_id: int, minutes: int) -> datetime:
     reminder = db.get(GuidanceReminder, reminder_id)
     if not reminder:
         raise HTTPException(status_code=404, detail="Reminder not found")
+    reminder.snoozed_until = datetime.utcnow() + timedelta(minutes=minutes)
+    reminder.last_shown_at = datetime.utcnow()
+    db.add(reminder)
+    db.commit()
+    return reminder.snoozed_until
+
+
+@router.post("/nudges/{reminder_id}/snooze")
+async def snooze_nudge(reminder_id: int, request: Request, db: Session | AsyncSession = Depends(get_async_db)):
     try:
         payload = await request.json()
     except Exception:
@@ -274,15 +286,17 @@ async def snooze_nudge(reminder_id: int, request: Request, db: Session = Depends
     if minutes <= 0 or minutes > 60 * 24 * 14:
         raise HTTPException(status_code=400, detail="Invalid snooze duration")
 
-    reminder.snoozed_until = datetime.utcnow() + timedelta(minutes=minutes)
-    reminder.last_shown_at = datetime.utcnow()
-    db.add(reminder)
+    snoozed_until = await run_db(db, _snooze, reminder_id, minutes)
+    return JSONResponse({"ok": True, "snoozed_until": snoozed_until.isoformat()})
+
+
+def _record_event(db: Session, code: str, context_json: str) -> None:
+    db.add(GuidanceEvent(code=code, context_json=context_json))
     db.commit()
-    return JSONResponse({"ok": True, "snoozed_until": reminder.snoozed_until.isoformat()})
 
 
 @router.post("/nudges/displacement/ack")
-async def acknowledge_displacement(request: Request, db: Session = Depends(get_db)):
+async def acknowledge_displacement(request: Request, db: Session | AsyncSession = Depends(get_async_db)):
     try:
         payload = await request.json()
     except Exception:
@@ -293,7 +307,5 @@ async def acknowledge_displacement(request: Request, db: Session = Depends(get_d
         "title": (payload.get("title") or "").strip() or None,
     }
     context_json = json.dumps(context, ensure_ascii=True)
-    event = GuidanceEvent(code="displacement_check", context_json=context_json)
-    db.add(event)
-    db.commit()
+    await run_db(db, _record_event, "displacement_check", context_json)
     return JSONResponse({"ok": True})
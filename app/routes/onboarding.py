@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import Project, ProjectCategory
 from ..security import csrf_protect, require_html_auth
 from ..utils.coach import build_coach_context_json
@@ -47,7 +47,7 @@ def _seed_projects(
 
 
 @router.get("/onboarding", response_class=HTMLResponse)
-def onboarding(request: Request, db: Session = Depends(get_db)):
+def onboarding(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     profile = get_profile(db)
     coach_context_json = build_coach_context_json(
@@ -55,7 +55,6 @@ def onboarding(request: Request, db: Session = Depends(get_db)):
         screen_id="onboarding",
         screen_title="Welcome",
         screen_data={},
-        db=db,
     )
     return templates.TemplateResponse(
         "onboarding.html",
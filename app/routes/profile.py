@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import Project
 from ..security import csrf_protect, require_html_auth
 from ..utils.coach import build_coach_context_json, project_summary
@@ -14,7 +14,7 @@ router = APIRouter(dependencies=[Depends(require_html_auth), Depends(csrf_protec
 
 
 @router.get("/profile", response_class=HTMLResponse)
-def profile_page(request: Request, db: Session = Depends(get_db)):
+def profile_page(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     profile = get_profile(db)
     projects = db.query(Project).order_by(Project.created_at.desc()).all()
@@ -23,7 +23,6 @@ def profile_page(request: Request, db: Session = Depends(get_db)):
         screen_id="profile",
         screen_title="Profile",
         screen_data={"projects": [project_summary(p) for p in projects]},
-        db=db,
     )
     return templates.TemplateResponse(
         "profile.html",
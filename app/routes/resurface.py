@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session, selectinload
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import Task, TaskStatus, WhenBucket
 from ..utils.coach import build_coach_context_json, task_summary
 from ..security import csrf_protect, require_html_auth
@@ -12,7 +12,7 @@ router = APIRouter(dependencies=[Depends(require_html_auth), Depends(csrf_protec
 
 
 @router.get("/resurface", response_class=HTMLResponse)
-def resurface(request: Request, db: Session = Depends(get_db)):
+def resurface(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     today = date.today()
     upcoming = today + timedelta(days=7)
@@ -35,7 +35,6 @@ def resurface(request: Request, db: Session = Depends(get_db)):
             "today": today.isoformat(),
             "due_tasks": [task_summary(t) for t in due],
         },
-        db=db,
     )
     return templates.TemplateResponse(
         "resurface.html",
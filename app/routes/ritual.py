@@ -3,9 +3,11 @@ from fastapi import APIRouter, Depends, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import Block, BlockType, Project, ProjectCategory, ProjectStatus, RitualEntry, RitualType
 from ..utils.coach import build_coach_context_json, ritual_summary
+from ..utils.calendar_feeds import calendar_events_for_day
+from ..utils.calendar_layout import block_item, feed_item
 from ..security import csrf_protect, require_html_auth
 
 router = APIRouter(dependencies=[Depends(require_html_auth), Depends(csrf_protect)])
@@ -42,43 +44,26 @@ def _get_last(db: Session, ritual_type: RitualType) -> RitualEntry | None:
     )
 
 
-def _format_time(value) -> str:
-    return value.strftime("%I:%M %p").lstrip("0")
-
-
 def _summarize_blocks(blocks: list[Block]) -> list[dict]:
     items = []
     for block in blocks:
         label = block.title or block.block_type.value.title()
         if block.project:
             label = f"{label} · {block.project.title}"
-        if block.start_time:
-            start_label = _format_time(block.start_time)
-            end_label = _format_time(block.end_time) if block.end_time else ""
-            time_label = f"{start_label} - {end_label}" if end_label else start_label
-        else:
-            time_label = "Anytime"
-        items.append({"label": label, "time": time_label})
+        item = block_item(block)
+        items.append({"label": label, "time": item.time_label if item else "Anytime"})
     return items
 
 
-def _summarize_events(events: list[dict]) -> list[dict]:
-    items = []
-    for event in events:
-        if event.get("is_all_day"):
-            time_label = "All day"
-        else:
-            start_dt = event.get("start")
-            end_dt = event.get("end")
-            start_label = _format_time(start_dt) if start_dt else ""
-            end_label = _format_time(end_dt) if end_dt else ""
-            time_label = f"{start_label} - {end_label}" if end_label else start_label
-        items.append({"label": event.get("label") or "Calendar event", "time": time_label})
-    return items
+def _summarize_events(events: list[dict], day: date) -> list[dict]:
+    return [
+        {"label": event.get("label") or "Calendar event", "time": feed_item(event, day).time_label}
+        for event in events
+    ]
 
 
 @router.get("/ritual/morning", response_class=HTMLResponse)
-def morning(request: Request, db: Session = Depends(get_db)):
+def morning(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     today = date.today()
     last_entry = _get_last(db, RitualType.MORNING)
@@ -98,10 +83,8 @@ def morning(request: Request, db: Session = Depends(get_db)):
     )
     weekly_work = [p for p in weekly_projects if p.category == ProjectCategory.WORK]
     weekly_personal = [p for p in weekly_projects if p.category == ProjectCategory.PERSONAL]
-    from .homepage import _fetch_cozi_events
-
-    cozi_events, cozi_status = _fetch_cozi_events(today)
-    cozi_error = None if cozi_status.startswith("OK") else cozi_status
+    external_events, feed_status = calendar_events_for_day(today)
+    feed_error = None if feed_status.startswith("OK") else feed_status
     last_evening = (
         db.query(RitualEntry)
         .filter(RitualEntry.ritual_type == RitualType.EVENING, RitualEntry.entry_date < today)
@@ -116,7 +99,6 @@ def morning(request: Request, db: Session = Depends(get_db)):
             "ritual_type": RitualType.MORNING.value,
             "last_entry": ritual_summary(last_entry) if last_entry else None,
         },
-        db=db,
     )
     return _render(
         templates,
@@ -128,8 +110,8 @@ def morning(request: Request, db: Session = Depends(get_db)):
         {
             "focus_blocks": _summarize_blocks(focus_blocks),
             "admin_blocks": _summarize_blocks(admin_blocks),
-            "cozi_events": _summarize_events(cozi_events),
-            "cozi_error": cozi_error,
+            "external_events": _summarize_events(external_events, today),
+            "feed_error": feed_error,
             "weekly_work_projects": weekly_work,
             "weekly_personal_projects": weekly_personal,
             "last_evening": last_evening,
@@ -138,7 +120,7 @@ def morning(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/ritual/midday", response_class=HTMLResponse)
-def midday(request: Request, db: Session = Depends(get_db)):
+def midday(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     last_entry = _get_last(db, RitualType.MIDDAY)
     coach_context_json = build_coach_context_json(
@@ -149,7 +131,6 @@ def midday(request: Request, db: Session = Depends(get_db)):
             "ritual_type": RitualType.MIDDAY.value,
             "last_entry": ritual_summary(last_entry) if last_entry else None,
         },
-        db=db,
     )
     return _render(
         templates,
@@ -162,7 +143,7 @@ def midday(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/ritual/evening", response_class=HTMLResponse)
-def evening(request: Request, db: Session = Depends(get_db)):
+def evening(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     last_entry = _get_last(db, RitualType.EVENING)
     coach_context_json = build_coach_context_json(
@@ -173,7 +154,6 @@ def evening(request: Request, db: Session = Depends(get_db)):
             "ritual_type": RitualType.EVENING.value,
             "last_entry": ritual_summary(last_entry) if last_entry else None,
         },
-        db=db,
     )
     return _render(
         templates,
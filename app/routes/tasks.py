@@ -4,9 +4,11 @@ from datetime import datetime, date, timedelta
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
+from starlette.concurrency import run_in_threadpool
 
-from ..db import get_db
+from ..db import get_async_read_db, get_db, run_db
 from ..models import (
     Alignment,
     BlockType,
@@ -26,9 +28,7 @@ def _task_is_active(task: Task) -> bool:
     return task.status in {TaskStatus.PENDING, TaskStatus.IN_PROGRESS}
 
 
-@router.get("/tasks", response_class=HTMLResponse)
-def tasks_board(request: Request, db: Session = Depends(get_db)):
-    templates = request.app.state.templates
+def _load_tasks_board(db: Session) -> tuple[list[Project], list[Task]]:
     projects = db.query(Project).order_by(Project.created_at.desc()).all()
     rows = (
         db.query(Task)
@@ -36,6 +36,11 @@ def tasks_board(request: Request, db: Session = Depends(get_db)):
         .order_by(Task.created_at.desc())
         .all()
     )
+    return projects, rows
+
+
+def _render_tasks_board(request: Request, projects: list[Project], rows: list[Task]) -> HTMLResponse:
+    templates = request.app.state.templates
     active_tasks = [t for t in rows if _task_is_active(t)]
     completed_tasks = [t for t in rows if t.status == TaskStatus.DONE]
     archived_tasks = [t for t in rows if t.status in {TaskStatus.ARCHIVED, TaskStatus.CANCELLED}]
@@ -68,7 +73,6 @@ def tasks_board(request: Request, db: Session = Depends(get_db)):
             "tasks": [task_summary(t) for t in active_tasks],
             "completed_count": len(completed_tasks),
         },
-        db=db,
     )
 
     return templates.TemplateResponse(
@@ -90,6 +94,12 @@ def tasks_board(request: Request, db: Session = Depends(get_db)):
     )
 
 
+@router.get("/tasks", response_class=HTMLResponse)
+async def tasks_board(request: Request, db: Session | AsyncSession = Depends(get_async_read_db)):
+    projects, rows = await run_db(db, _load_tasks_board)
+    return await run_in_threadpool(_render_tasks_board, request, projects, rows)
+
+
 @router.post("/tasks/update")
 def update_task(
     task_id: int = Form(...),
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, Request, HTTPException, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session, selectinload
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import WaitingOn
 from ..utils.coach import build_coach_context_json, waiting_summary
 from ..security import csrf_protect, require_html_auth
@@ -12,7 +12,7 @@ router = APIRouter(dependencies=[Depends(require_html_auth), Depends(csrf_protec
 
 
 @router.get("/waiting", response_class=HTMLResponse)
-def list_waiting(request: Request, db: Session = Depends(get_db)):
+def list_waiting(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     rows = (
         db.query(WaitingOn)
@@ -25,7 +25,6 @@ def list_waiting(request: Request, db: Session = Depends(get_db)):
         screen_id="waiting",
         screen_title="Waiting on",
         screen_data={"waiting_on": [waiting_summary(r) for r in rows]},
-        db=db,
     )
     return templates.TemplateResponse(
         "waiting.html",
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy.orm import Session, selectinload
 
-from ..db import get_db
+from ..db import get_db, get_read_db
 from ..models import Project, ProjectCategory, Task, TaskStatus, GuidanceEvent
 from ..utils.coach import build_coach_context_json, project_summary, task_summary
 from ..utils.rules import enforce_weekly_cap
@@ -14,7 +14,7 @@ router = APIRouter(dependencies=[Depends(require_html_auth), Depends(csrf_protec
 
 
 @router.get("/weekly", response_class=HTMLResponse)
-def weekly_review(request: Request, db: Session = Depends(get_db)):
+def weekly_review(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     projects = (
         db.query(Project)
@@ -50,7 +50,6 @@ def weekly_review(request: Request, db: Session = Depends(get_db)):
             "weekly_personal_count": len(weekly_personal),
             "due_resurface": [task_summary(t) for t in due_resurface],
         },
-        db=db,
     )
 
     return templates.TemplateResponse(
@@ -68,7 +67,7 @@ def weekly_review(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/weekly/wizard", response_class=HTMLResponse)
-def weekly_wizard(request: Request, db: Session = Depends(get_db)):
+def weekly_wizard(request: Request, db: Session = Depends(get_read_db)):
     templates = request.app.state.templates
     projects = (
         db.query(Project)
@@ -116,7 +115,6 @@ def weekly_wizard(request: Request, db: Session = Depends(get_db)):
             "due_resurface": [task_summary(t) for t in due_resurface],
             "completed_tasks": [task_summary(t) for t in completed_this_week],
         },
-        db=db,
     )
     return templates.TemplateResponse(
         "weekly_wizard.html",
@@ -56,7 +56,8 @@ def _login_redirect(request: Request) -> None:
     )
 
 
-def require_html_auth(request: Request) -> None:
+# Async so the per-route auth check never needs a threadpool worker; it only reads the session.
+async def require_html_auth(request: Request) -> None:
     if not ui_auth_enabled():
         return
     if request.session.get(SESSION_USER_KEY):
@@ -64,7 +65,7 @@ def require_html_auth(request: Request) -> None:
     _login_redirect(request)
 
 
-def require_api_auth(request: Request) -> None:
+async def require_api_auth(request: Request) -> None:
     if not api_auth_enabled():
         return
     token = api_token()
@@ -181,6 +181,24 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
+  const inboxList = document.querySelector("[data-inbox-list]");
+  if (inboxList) {
+    inboxList.addEventListener("click", async (event) => {
+      const button = event.target.closest("[data-inbox-more]");
+      if (!button || button.disabled) return;
+      button.disabled = true;
+      try {
+        const res = await fetch(button.dataset.inboxMore, { headers: { Accept: "text/html" } });
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        // The returned page brings its own "Load more" button when there is more to show.
+        button.insertAdjacentHTML("beforebegin", await res.text());
+        button.remove();
+      } catch (err) {
+        button.disabled = false;
+      }
+    });
+  }
+
   const weeklyWizard = document.querySelector("[data-weekly-wizard]");
   if (weeklyWizard) {
     const steps = Array.from(weeklyWizard.querySelectorAll(".wizard-step"));
@@ -249,12 +267,74 @@ document.addEventListener("DOMContentLoaded", () => {
   updateClock();
   setInterval(updateClock, 1000);
 
-  // Auto-refresh calendar views every minute to pick up new events (avoid disrupting forms).
-  const hasCalendar = document.querySelector(".calendar-panel, .week-calendar-panel");
-  if (hasCalendar) {
-    setInterval(() => {
-      window.location.reload();
-    }, 60 * 1000);
+  // Poll calendar views every minute and repaint only the day columns that changed.
+  // Polling pauses while the tab is hidden and catches up as soon as it is shown again.
+  const calendarPanel = document.querySelector("[data-calendar-view]");
+  if (calendarPanel) {
+    const view = calendarPanel.dataset.calendarView;
+    let version = calendarPanel.dataset.calendarVersion || "";
+    let timer = null;
+
+    const applyCalendarStatus = (data) => {
+      const meta = calendarPanel.querySelector("[data-calendar-meta]");
+      if (meta && data.meta) meta.textContent = data.meta;
+      const errorEl = calendarPanel.querySelector("[data-calendar-error]");
+      if (errorEl) {
+        errorEl.textContent = data.error || "";
+        errorEl.classList.toggle("hidden", !data.error);
+      }
+    };
+
+    const applyCalendarChanges = (data) => {
+      let complete = true;
+      (data.days || []).forEach((day) => {
+        const slot = calendarPanel.querySelector(`[data-calendar-day="${day.iso}"]`);
+        if (!slot) {
+          // The date rolled over; the columns themselves have moved.
+          window.location.reload();
+          return;
+        }
+        if (slot.dataset.digest === day.digest) return;
+        if (slot.querySelector(".event-edit-form:not(.hidden)")) {
+          // Leave a column with an open edit form alone; retry on the next poll.
+          complete = false;
+          return;
+        }
+        slot.innerHTML = day.html;
+        slot.dataset.digest = day.digest;
+      });
+      if (complete) version = data.version;
+    };
+
+    const pollCalendar = async () => {
+      try {
+        const params = new URLSearchParams({ view, since: version });
+        const res = await fetch(`/calendar/changes?${params}`, { headers: { Accept: "application/json" } });
+        if (!res.ok) return;
+        const data = await res.json();
+        applyCalendarStatus(data);
+        if (data.changed) {
+          applyCalendarChanges(data);
+        } else {
+          version = data.version;
+        }
+      } catch (err) {
+        // Ignore transient refresh failures; the next poll retries.
+      }
+    };
+
+    const schedulePolling = () => {
+      clearInterval(timer);
+      timer = null;
+      if (document.visibilityState === "hidden") return;
+      timer = setInterval(pollCalendar, 60 * 1000);
+    };
+
+    document.addEventListener("visibilitychange", () => {
+      if (document.visibilityState === "visible") pollCalendar();
+      schedulePolling();
+    });
+    schedulePolling();
   }
 
   document.addEventListener("click", (event) => {
@@ -795,6 +875,51 @@ document.addEventListener("DOMContentLoaded", () => {
       }
     };
 
+    // The server keeps the rendered screen context; send its id and fall back to the
+    // full context only if the server no longer recognises it (e.g. after a restart).
+    const postCoachMessage = (body) =>
+      fetch("/coach/message/stream", {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          Accept: "text/event-stream",
+          "x-csrf-token": csrfToken || "",
+        },
+        body: JSON.stringify(body),
+      });
+
+    // Parse the SSE reply: "delta" events carry text chunks, "done" carries actions, engine + latency meta.
+    const readCoachStream = async (res, onDelta) => {
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let result = null;
+      const handleEvent = (raw) => {
+        let eventName = "message";
+        const dataLines = [];
+        raw.split("\n").forEach((line) => {
+          if (line.startsWith("event:")) eventName = line.slice(6).trim();
+          else if (line.startsWith("data:")) dataLines.push(line.slice(5).trim());
+        });
+        if (!dataLines.length) return;
+        const data = JSON.parse(dataLines.join("\n"));
+        if (eventName === "delta") onDelta(data.text || "");
+        else if (eventName === "done") result = data;
+      };
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let boundary = buffer.indexOf("\n\n");
+        while (boundary !== -1) {
+          handleEvent(buffer.slice(0, boundary));
+          buffer = buffer.slice(boundary + 2);
+          boundary = buffer.indexOf("\n\n");
+        }
+      }
+      return result;
+    };
+
     const sendMessage = async (text) => {
       const message = (text || "").trim();
       if (!message) return;
@@ -803,19 +928,33 @@ document.addEventListener("DOMContentLoaded", () => {
       setStatus("Thinking...");
       const pending = addMessage("assistant", "Thinking...");
       try {
-        const res = await fetch("/coach/message", {
-          method: "POST",
-          headers: {
-            "Content-Type": "application/json",
-            "x-csrf-token": csrfToken || "",
-          },
-          body: JSON.stringify({ message, screen_context: context }),
+        let res = await postCoachMessage(
+          context.context_id
+            ? { message, context_id: context.context_id }
+            : { message, screen_context: context }
+        );
+        if (res.status === 409) {
+          res = await postCoachMessage({ message, screen_context: context });
+        }
+        if (!res.ok || !res.body) {
+          const data = await res.json().catch(() => ({}));
+          throw new Error(data.detail || "Coach error");
+        }
+        let reply = "";
+        const data = await readCoachStream(res, (chunk) => {
+          reply += chunk;
+          if (pending) pending.textContent = reply;
+          if (messagesEl) messagesEl.scrollTop = messagesEl.scrollHeight;
         });
-        const data = await res.json();
-        if (!res.ok) throw new Error(data.detail || "Coach error");
-        if (pending) pending.textContent = data.reply || "No response yet.";
+        if (!data) throw new Error("Coach stream ended early");
+        if (pending && !reply.trim()) pending.textContent = "No response yet.";
         renderQuickActions(data.actions);
-        setStatus(data.engine === "ollama" ? "Local LLM" : "Coach-lite");
+        const meta = data.meta || {};
+        setStatus(
+          data.engine === "ollama"
+            ? meta.model_state === "cold" ? "Local LLM (cold start)" : "Local LLM"
+            : "Coach-lite"
+        );
       } catch (err) {
         if (pending) pending.textContent = "Couldn't reach Charlie just now. Try again.";
         setStatus("Offline");
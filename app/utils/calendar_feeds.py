@@ -0,0 +1,867 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+import ssl
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.error import HTTPError
+from urllib.request import Request as UrlRequest, urlopen
+from zoneinfo import ZoneInfo
+
+import certifi
+from dateutil.rrule import rruleset, rrulestr
+from icalendar.cal import Component
+
+from ..db import ReadSessionLocal, SessionLocal
+from ..models import CalendarFeedCache
+
+CALENDAR_CACHE_TTL_SECONDS = 60
+_DEFAULT_COZI_LABEL_COLORS = "Brynlee=#ff2bd1,Jessica=#3ce37c"
+# Colours handed to SFO_CALENDAR_FEEDS entries that do not name one.
+_FEED_PALETTE = ("#ffb02e", "#9b7bff", "#3ce3c8", "#ff6b6b", "#2fb8ff")
+_FETCH_TIMEOUT_SECONDS = 10
+# Stored with each parse; a feed parsed by another version is fetched and parsed afresh.
+_PARSER_VERSION = "6"
+# Events that ended before, or start after, this many days from today are skipped while parsing.
+_DEFAULT_PAST_DAYS = 60
+_DEFAULT_FUTURE_DAYS = 400
+# Events spanning more days than this are kept out of the day buckets and checked directly.
+_LONG_EVENT_DAYS = 31
+# Expanded recurring occurrences are cached per requested window (a day, or a week).
+_WINDOW_CACHE_SIZE = 16
+
+
+class CalendarIndex:
+    """Per-day buckets over normalised events, built once per feed refresh.
+
+    Day and week lookups read a handful of buckets instead of scanning every event;
+    multi-day events are expanded into their days here rather than on each request.
+    Recurring series are expanded lazily, only for the window being asked for.
+    """
+
+    def __init__(self, events: list[dict]):
+        self.events = sorted(events, key=_event_start)
+        self._days: dict[date, list[dict]] = {}
+        self._long: list[dict] = []
+        self._series: list[dict] = []
+        self._rules: dict[int, rruleset] = {}
+        self._windows: OrderedDict[tuple[date, date], dict[date, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Occurrences moved or edited individually (RECURRENCE-ID) replace the generated ones.
+        self._overrides = {
+            (ev["uid"], ev["recurrence_id"]) for ev in self.events if ev.get("recurrence_id")
+        }
+        for ev in self.events:
+            if ev.get("series"):
+                self._series.append(ev)
+                continue
+            first = ev["start"].date()
+            last = ev["end"].date()
+            if (last - first).days > _LONG_EVENT_DAYS:
+                self._long.append(ev)
+                continue
+            cur = first
+            while cur <= last:
+                self._days.setdefault(cur, []).append(ev)
+                cur += timedelta(days=1)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def on_day(self, day: date) -> list[dict]:
+        return self.by_day(day, day)[day]
+
+    def by_day(self, first: date, last: date) -> dict[date, list[dict]]:
+        days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+        recurring = self._occurrences(first, last) if self._series else {}
+        result = {}
+        for day in days:
+            events = list(self._days.get(day, ()))
+            extra = [ev for ev in self._long if ev["start"].date() <= day <= ev["end"].date()]
+            extra.extend(recurring.get(day, ()))
+            if extra:
+                events = sorted(events + extra, key=_event_start)
+            result[day] = events
+        return result
+
+    def _rule(self, ev: dict) -> rruleset:
+        rules = self._rules.get(id(ev))
+        if rules is None:
+            series = ev["series"]
+            anchor = datetime.fromisoformat(series["start"])
+            rules = rruleset(cache=True)
+            if series["rrule"]:
+                rules.rrule(rrulestr(series["rrule"], dtstart=anchor, ignoretz=True))
+            else:
+                # RDATE alone: DTSTART is the first occurrence, the RDATEs add the rest.
+                rules.rdate(anchor)
+            for value in series["rdates"]:
+                rules.rdate(datetime.fromisoformat(value))
+            for value in series["exdates"]:
+                rules.exdate(datetime.fromisoformat(value))
+            self._rules[id(ev)] = rules
+        return rules
+
+    def _occurrences(self, first: date, last: date) -> dict[date, list[dict]]:
+        key = (first, last)
+        with self._lock:
+            cached = self._windows.get(key)
+            if cached is not None:
+                self._windows.move_to_end(key)
+                return cached
+            buckets = self._expand(first, last)
+            self._windows[key] = buckets
+            while len(self._windows) > _WINDOW_CACHE_SIZE:
+                self._windows.popitem(last=False)
+            return buckets
+
+    def _expand(self, first: date, last: date) -> dict[date, list[dict]]:
+        buckets: dict[date, list[dict]] = {}
+        for ev in self._series:
+            series = ev["series"]
+            duration = timedelta(seconds=series["duration"])
+            zone = ZoneInfo(series["tzid"]) if series["tzid"] else None
+            # Pad by the duration and a day either side to absorb time-zone shifts.
+            window_start = datetime.combine(first, time.min) - duration - timedelta(days=1)
+            window_end = datetime.combine(last, time.max) + timedelta(days=1)
+            try:
+                starts = self._rule(ev).between(window_start, window_end, inc=True)
+            except Exception:
+                continue
+            for wall_start in starts:
+                wall_end = wall_start + duration
+                if zone is not None:
+                    start_dt = wall_start.replace(tzinfo=zone).astimezone().replace(tzinfo=None)
+                    end_dt = wall_end.replace(tzinfo=zone).astimezone().replace(tzinfo=None)
+                else:
+                    start_dt, end_dt = wall_start, wall_end
+                if (ev["uid"], start_dt.isoformat()) in self._overrides:
+                    continue
+                if ev["is_all_day"]:
+                    end_dt -= timedelta(seconds=1)
+                occurrence = {k: v for k, v in ev.items() if k != "series"}
+                occurrence.update({"start": start_dt, "end": end_dt})
+                cur = max(start_dt.date(), first)
+                while cur <= min(end_dt.date(), last):
+                    buckets.setdefault(cur, []).append(occurrence)
+                    cur += timedelta(days=1)
+        return buckets
+
+
+def _event_start(ev: dict) -> datetime:
+    return ev["start"]
+
+
+_EMPTY_INDEX = CalendarIndex([])
+
+# Per-feed state, keyed on the source key. Requests always read the last good parse from
+# here; a background thread revalidates each feed once its own TTL lapses
+# (stale-while-revalidate), so feeds refresh concurrently and independently.
+_FEEDS: dict[str, dict] = {}
+# Events of every feed merged into one index, rebuilt only when one of the feed indexes changes.
+_MERGED: dict = {"parts": (), "index": _EMPTY_INDEX}
+_FEEDS_LOCK = threading.Condition()
+# Per-feed refresh counters for calendar_feed_stats(); only touched under _FEEDS_LOCK.
+_STAT_NAMES = ("refreshes", "downloads", "not_modified", "parses", "unchanged", "errors", "coalesced")
+_STATS: dict[str, dict[str, int]] = {}
+
+
+def _new_feed_state(url: str | None) -> dict:
+    return {
+        "url": url,
+        "index": _EMPTY_INDEX,
+        "fetched_at": None,
+        "checked_at": None,
+        "error": None,
+        "refreshing": False,
+        # HTTP validators and body digest of the last download, so unchanged feeds skip parsing.
+        "etag": None,
+        "last_modified": None,
+        "body_hash": None,
+        # What the events were parsed for; see _parse_key().
+        "parse_key": None,
+    }
+
+
+def _count(key: str, name: str) -> None:
+    stats = _STATS.setdefault(key, dict.fromkeys(_STAT_NAMES, 0))
+    stats[name] += 1
+
+
+def _source_key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "feed"
+
+
+def _parse_label_colors(raw: str) -> tuple[tuple[str, str], ...]:
+    pairs = []
+    for item in raw.split(","):
+        prefix, _, color = item.partition("=")
+        if prefix.strip() and color.strip():
+            pairs.append((prefix.strip().lower(), color.strip()))
+    return tuple(pairs)
+
+
+def _positive_int(raw: str | None, default: int) -> int:
+    raw = (raw or "").strip()
+    return int(raw) if raw.isdigit() and int(raw) > 0 else default
+
+
+@lru_cache(maxsize=4)
+def _parse_sources(cozi_url: str, cozi_color: str, cozi_labels: str, feeds: str) -> tuple[dict, ...]:
+    sources: list[dict] = []
+    if cozi_url:
+        sources.append(
+            {
+                "key": "cozi",
+                "name": "Cozi",
+                "url": cozi_url,
+                "color": cozi_color or None,
+                "ttl": CALENDAR_CACHE_TTL_SECONDS,
+                "label_colors": _parse_label_colors(cozi_labels),
+            }
+        )
+    for entry in re.split(r"[;\n]", feeds):
+        parts = [part.strip() for part in entry.split("|")]
+        if len(parts) < 2 or not parts[0] or not parts[1]:
+            continue
+        name, url = parts[0], parts[1]
+        color = parts[2] if len(parts) > 2 and parts[2] else None
+        sources.append(
+            {
+                "key": _source_key(name),
+                "name": name,
+                "url": url,
+                "color": color or _FEED_PALETTE[len(sources) % len(_FEED_PALETTE)],
+                "ttl": _positive_int(parts[3] if len(parts) > 3 else None, CALENDAR_CACHE_TTL_SECONDS),
+                "label_colors": (),
+            }
+        )
+    # One entry per key and per location: both identify a feed's cache.
+    unique: list[dict] = []
+    for source in sources:
+        if all(s["key"] != source["key"] and s["url"] != source["url"] for s in unique):
+            unique.append(source)
+    return tuple(unique)
+
+
+def calendar_sources() -> tuple[dict, ...]:
+    """Configured feeds: `COZI_ICS_URL` plus any `SFO_CALENDAR_FEEDS` entries.
+
+    `SFO_CALENDAR_FEEDS` holds `name|url-or-path[|colour[|ttl seconds]]` entries separated by
+    `;` or newlines, e.g. `Work|https://example.com/work.ics|#ffb02e|300;School|~/school.ics`.
+    """
+    return _parse_sources(
+        (os.getenv("COZI_ICS_URL") or "").strip(),
+        (os.getenv("COZI_COLOR") or "").strip(),
+        os.getenv("COZI_LABEL_COLORS", _DEFAULT_COZI_LABEL_COLORS),
+        os.getenv("SFO_CALENDAR_FEEDS") or "",
+    )
+
+
+def event_color(ev: dict) -> str | None:
+    """Display colour for an external event: a matching label prefix first, then its feed's."""
+    for source in calendar_sources():
+        if source["key"] != ev.get("source"):
+            continue
+        label = (ev.get("label") or "").lower()
+        for prefix, color in source["label_colors"]:
+            if label.startswith(prefix):
+                return color
+        return source["color"]
+    return None
+
+
+def split_cozi_label(label: str) -> tuple[str | None, str | None]:
+    if ":" not in label:
+        return None, None
+    prefix, remainder = label.split(":", 1)
+    prefix = prefix.strip()
+    remainder = remainder.strip()
+    if not prefix:
+        return None, None
+    return f"{prefix}:", remainder or None
+
+
+def _download(url: str, etag: str | None, last_modified: str | None) -> tuple[bytes | None, dict]:
+    """GET the feed conditionally; returns (None, headers) when the server answers 304."""
+    if not url.startswith(("http://", "https://")):
+        return _read_file(url, last_modified)
+    headers = {
+        "User-Agent": "Mozilla/5.0 (StartFinishing/0.2)",
+        "Accept": "text/calendar,*/*",
+    }
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    ssl_ctx = ssl.create_default_context(cafile=certifi.where())
+    try:
+        with urlopen(UrlRequest(url, headers=headers), timeout=_FETCH_TIMEOUT_SECONDS, context=ssl_ctx) as resp:
+            return resp.read(), dict(resp.headers)
+    except HTTPError as exc:
+        if exc.code == 304:
+            return None, dict(exc.headers or {})
+        raise
+
+
+def _as_local_naive(value: date | datetime) -> datetime:
+    if not isinstance(value, datetime):
+        return datetime.combine(value, time.min)
+    if value.tzinfo:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _tzid(value: date | datetime) -> str | None:
+    tz = getattr(value, "tzinfo", None)
+    if tz is None:
+        return None
+    name = getattr(tz, "zone", None) or getattr(tz, "key", None)
+    if name:
+        try:
+            ZoneInfo(name)
+            return name
+        except Exception:
+            pass
+    return None
+
+
+def _wall_time(value: date | datetime, tzid: str | None) -> datetime:
+    """Clock time of `value` in the series' zone (or local time when the zone is unknown)."""
+    if not isinstance(value, datetime):
+        return datetime.combine(value, time.min)
+    if value.tzinfo is None:
+        return value
+    if tzid:
+        return value.astimezone(ZoneInfo(tzid)).replace(tzinfo=None)
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _date_list(prop, tzid: str | None) -> list[str]:
+    if prop is None:
+        return []
+    props = prop if isinstance(prop, list) else [prop]
+    return [_wall_time(item.dt, tzid).isoformat() for p in props for item in p.dts]
+
+
+def _normalise_event(component, source: dict) -> dict | None:
+    """Turn one VEVENT into the dict the calendar views use, or None when it has no start."""
+    dtstart = component.get("dtstart")
+    if not dtstart:
+        return None
+    dtend = component.get("dtend")
+    duration_prop = component.get("duration")
+    summary = (component.get("summary") or "").strip() or f"{source['name']} event"
+
+    start = dtstart.dt
+    end = dtend.dt if dtend else None
+    if end is None and duration_prop is not None:
+        end = start + duration_prop.dt
+    is_all_day = isinstance(start, date) and not isinstance(start, datetime)
+    if isinstance(end, date) and not isinstance(end, datetime):
+        is_all_day = True
+
+    if isinstance(start, date) and not isinstance(start, datetime):
+        start_dt = datetime.combine(start, time.min)
+    else:
+        start_dt = start
+
+    if isinstance(end, date) and not isinstance(end, datetime):
+        # iCal all-day events use an exclusive end date; subtract a tick for display logic.
+        end_dt = datetime.combine(end, time.min) - timedelta(seconds=1)
+    else:
+        end_dt = end
+
+    if isinstance(start_dt, datetime) and start_dt.tzinfo:
+        start_dt = start_dt.astimezone().replace(tzinfo=None)
+    if isinstance(end_dt, datetime) and end_dt and end_dt.tzinfo:
+        end_dt = end_dt.astimezone().replace(tzinfo=None)
+
+    if end_dt is None:
+        end_dt = start_dt + timedelta(hours=1)
+
+    label_prefix, label_suffix = split_cozi_label(summary)
+    event = {
+        "label": summary,
+        "label_prefix": label_prefix,
+        "label_suffix": label_suffix,
+        "start": start_dt,
+        "end": end_dt,
+        "is_all_day": is_all_day,
+        "uid": str(component.get("uid") or "") or None,
+        "source": source["key"],
+    }
+    recurrence_id = component.get("recurrence-id")
+    if recurrence_id is not None:
+        event["recurrence_id"] = _as_local_naive(recurrence_id.dt).isoformat()
+
+    rrule = component.get("rrule")
+    rdate = component.get("rdate")
+    if rrule is not None or rdate is not None:
+        # Keep the rule and its anchor in the series' own zone so DST shifts expand correctly;
+        # occurrences are generated per requested window by CalendarIndex.
+        tzid = _tzid(start)
+        rule = None
+        if rrule is not None:
+            rule = rrule.copy()
+            until = (rule.get("UNTIL") or [None])[0]
+            if isinstance(until, datetime) and until.tzinfo:
+                rule["UNTIL"] = [_wall_time(until, tzid)]
+        series_start = _wall_time(start, tzid)
+        if end is not None:
+            duration = _wall_time(end, tzid) - series_start
+        else:
+            duration = timedelta(days=1) if is_all_day else timedelta(hours=1)
+        event["series"] = {
+            "rrule": rule.to_ical().decode("utf-8") if rule is not None else None,
+            "start": series_start.isoformat(),
+            "tzid": tzid,
+            "duration": int(duration.total_seconds()),
+            "rdates": _date_list(rdate, tzid),
+            "exdates": _date_list(component.get("exdate"), tzid),
+        }
+    return event
+
+
+def _env_days(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    return int(raw) if raw and raw.isdigit() else default
+
+
+def _horizon() -> tuple[date, date]:
+    today = date.today()
+    return (
+        today - timedelta(days=_env_days("SFO_CALENDAR_PAST_DAYS", _DEFAULT_PAST_DAYS)),
+        today + timedelta(days=_env_days("SFO_CALENDAR_FUTURE_DAYS", _DEFAULT_FUTURE_DAYS)),
+    )
+
+
+def _iter_components(stream: Iterable[bytes]) -> Iterator[tuple[bytes, list[bytes]]]:
+    """Yield (name, raw lines) for each top-level VEVENT/VTIMEZONE without building the tree."""
+    name = None
+    block: list[bytes] = []
+    depth = 0
+    for raw in stream:
+        line = raw.rstrip(b"\r\n")
+        head = line[:16].upper()
+        if name is None:
+            if head in (b"BEGIN:VEVENT", b"BEGIN:VTIMEZONE"):
+                name, block, depth = head[6:], [line], 1
+            continue
+        block.append(line)
+        if head.startswith(b"BEGIN:"):
+            depth += 1
+        elif head.startswith(b"END:"):
+            depth -= 1
+            if depth == 0:
+                yield name, block
+                name = None
+
+
+def _ical_date(value: bytes | None) -> date | None:
+    try:
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    except (TypeError, ValueError):
+        return None
+
+
+def _outside_horizon(block: list[bytes], first: date, last: date) -> bool:
+    """Cheap check on the raw DTSTART/DTEND/RRULE lines, so skipped events are never parsed.
+
+    Anything it cannot bound from those (RDATE, DURATION, edited occurrences) is kept.
+    """
+    props: dict[bytes, bytes] = {}
+    for line in block:
+        if line[:1] in (b" ", b"\t"):
+            continue  # folded continuation; the values checked here are short
+        key = line.split(b":", 1)[0].split(b";", 1)[0].upper()
+        if key in (b"DTSTART", b"DTEND", b"DURATION", b"RRULE", b"RDATE", b"RECURRENCE-ID") and key not in props:
+            props[key] = line.rpartition(b":")[2]
+    if b"RECURRENCE-ID" in props:
+        return False  # an edited occurrence must survive to suppress the generated one
+    if b"RDATE" in props:
+        return False  # extra dates can fall anywhere; the series is expanded per window anyway
+    start = _ical_date(props.get(b"DTSTART"))
+    if start is None:
+        return False
+    slack = timedelta(days=1)  # time zones can move the local date either way
+    if start > last + slack:
+        return True
+    if b"DURATION" in props:
+        return False  # the end is DTSTART plus the duration, which is left to the full parse
+    rule = props.get(b"RRULE")
+    if rule is not None:
+        until = _ical_date(rule.upper().partition(b"UNTIL=")[2] or None)
+        return until is not None and until < first - slack
+    end = _ical_date(props.get(b"DTEND")) or start
+    return end < first - slack
+
+
+def _read_file(location: str, last_modified: str | None) -> tuple[bytes | None, dict]:
+    path = Path(location.removeprefix("file://")).expanduser()
+    # The file's mtime plays the part of Last-Modified.
+    mtime = str(path.stat().st_mtime_ns)
+    if mtime == last_modified:
+        return None, {}
+    return path.read_bytes(), {"Last-Modified": mtime}
+
+
+def _parse_events(data: bytes, source: dict) -> list[dict]:
+    """Stream VEVENTs out of the feed, dropping ones outside the configured horizon unparsed."""
+    first, last = _horizon()
+    events: list[dict] = []
+    for name, block in _iter_components(io.BytesIO(data)):
+        if name == b"VTIMEZONE":
+            # Parsing a VTIMEZONE registers it with icalendar for the TZIDs that follow.
+            Component.from_ical(b"\r\n".join(block))
+            continue
+        if _outside_horizon(block, first, last):
+            continue
+        event = _normalise_event(Component.from_ical(b"\r\n".join(block)), source)
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def _parse_key() -> str:
+    """Identify how the cached events were produced, so a change forces a fresh parse.
+
+    The horizon is part of it: it moves daily, and servers answering 304 would otherwise
+    keep the first day's horizon for as long as the worker runs.
+    """
+    first, last = _horizon()
+    return f"{_PARSER_VERSION}|{first.isoformat()}|{last.isoformat()}"
+
+
+def _feed_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _encode_events(events: list[dict]) -> str:
+    return json.dumps(
+        [{**ev, "start": ev["start"].isoformat(), "end": ev["end"].isoformat()} for ev in events],
+        ensure_ascii=True,
+        separators=(",", ":"),
+    )
+
+
+def _decode_events(raw: str, source: dict) -> list[dict]:
+    return [
+        {
+            **ev,
+            "start": datetime.fromisoformat(ev["start"]),
+            "end": datetime.fromisoformat(ev["end"]),
+            # Snapshots written before feeds were tagged belong to the feed they are keyed on.
+            "source": source["key"],
+        }
+        for ev in json.loads(raw)
+    ]
+
+
+def _load_snapshot(source: dict) -> bool:
+    """Seed a cold feed from the copy saved by its last successful refresh."""
+    url = source["url"]
+    try:
+        with ReadSessionLocal() as db:
+            row = db.get(CalendarFeedCache, _feed_key(url))
+            if row is None:
+                return False
+            events = _decode_events(row.events_json, source)
+            # SQLite drops the offset; the stored wall time is local.
+            fetched_at = row.fetched_at.astimezone()
+            validators = {
+                "etag": row.etag,
+                "last_modified": row.last_modified,
+                "body_hash": row.body_hash,
+                "parse_key": row.parse_key,
+            }
+    except Exception:
+        return False
+    with _FEEDS_LOCK:
+        state = _FEEDS.setdefault(source["key"], _new_feed_state(url))
+        state.update(
+            {
+                "url": url,
+                "index": CalendarIndex(events),
+                "fetched_at": fetched_at,
+                "checked_at": fetched_at,
+                "error": None,
+            }
+        )
+        state.update(validators)
+        _FEEDS_LOCK.notify_all()
+    return True
+
+
+def _save_snapshot(url: str, events: list[dict] | None, validators: dict, fetched_at: datetime) -> None:
+    try:
+        with SessionLocal() as db:
+            row = db.get(CalendarFeedCache, _feed_key(url))
+            if row is None:
+                if events is None:
+                    return
+                row = CalendarFeedCache(id=_feed_key(url))
+                db.add(row)
+            if events is not None:
+                row.events_json = _encode_events(events)
+            row.fetched_at = fetched_at
+            row.etag = validators.get("etag")
+            row.last_modified = validators.get("last_modified")
+            if "body_hash" in validators:
+                row.body_hash = validators["body_hash"]
+                row.parse_key = validators["parse_key"]
+            db.commit()
+    except Exception:
+        # The on-disk copy only speeds up restarts; the in-memory cache stays authoritative.
+        pass
+
+
+def _refresh(source: dict) -> None:
+    """Fetch and parse one feed, then publish it. Callers must have set its `refreshing` flag."""
+    key, url = source["key"], source["url"]
+    parse_key = _parse_key()
+    with _FEEDS_LOCK:
+        state = _FEEDS[key]
+        # Events parsed differently (another parser version or day) need the body again, so the
+        # stored validators are dropped: a 304 would otherwise keep them forever.
+        same_feed = state["url"] == url and state["parse_key"] == parse_key
+        etag = state["etag"] if same_feed else None
+        last_modified = state["last_modified"] if same_feed else None
+        body_hash = state["body_hash"] if same_feed else None
+    events: list[dict] | None = None
+    index = None
+    validators: dict = {}
+    error = None
+    outcome = "not_modified"
+    try:
+        body, headers = _download(url, etag, last_modified)
+        if body is None:
+            validators = {
+                "etag": headers.get("ETag") or etag,
+                "last_modified": headers.get("Last-Modified") or last_modified,
+            }
+        else:
+            validators = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+            digest = hashlib.sha256(body).hexdigest()
+            validators.update({"body_hash": digest, "parse_key": parse_key})
+            outcome = "unchanged"
+            # Parsing years of events dominates refresh cost; only do it when the bytes changed
+            # (body_hash is cleared when the parse key moved on).
+            if digest != body_hash:
+                events = _parse_events(body, source)
+                index = CalendarIndex(events)
+                outcome = "parses"
+    except Exception as exc:
+        error = f"{source['name']} fetch failed: {exc}"
+        outcome = "errors"
+    now = datetime.now().astimezone()  # cache timestamp in local tz
+    with _FEEDS_LOCK:
+        if state["url"] != url:
+            # Feed URL changed: never show the previous feed's events under the new one.
+            state.update(_new_feed_state(url))
+        if index is not None:
+            state["index"] = index
+        if error is None:
+            # A 304 or an identical body still confirms the cached events are current.
+            state["fetched_at"] = now
+            state.update(validators)
+        state.update({"checked_at": now, "error": error, "refreshing": False})
+        _count(key, "refreshes")
+        if outcome in ("unchanged", "parses"):
+            _count(key, "downloads")
+        _count(key, outcome)
+        _FEEDS_LOCK.notify_all()
+    if error is None:
+        _save_snapshot(url, events, validators, now)
+
+
+def _start_refresh(source: dict) -> None:
+    threading.Thread(
+        target=_refresh, args=(source,), name=f"calendar-refresh-{source['key']}", daemon=True
+    ).start()
+
+
+def _revalidate_in_background(source: dict) -> None:
+    with _FEEDS_LOCK:
+        state = _FEEDS.setdefault(source["key"], _new_feed_state(source["url"]))
+        if state["refreshing"]:
+            # Single flight: the refresh already running will publish for this caller too.
+            _count(source["key"], "coalesced")
+            return
+        state["refreshing"] = True
+    _start_refresh(source)
+
+
+def start_calendar_refresh() -> None:
+    """Startup hook: serve each feed's saved copy straight away and revalidate them in the background."""
+    for source in calendar_sources():
+        _load_snapshot(source)
+        _revalidate_in_background(source)
+
+
+def _age_label(seconds: float) -> str:
+    if seconds < 120:
+        return f"{int(seconds)}s"
+    if seconds < 7200:
+        return f"{int(seconds // 60)} min"
+    return f"{int(seconds // 3600)} h"
+
+
+def _feed_problem(source: dict, state: dict, now: datetime) -> str | None:
+    fetched_at = state["fetched_at"]
+    error = state["error"]
+    if fetched_at is None:
+        return error or f"{source['name']} feed loading"
+    if error:
+        return f"{error} (showing events from {_age_label((now - fetched_at).total_seconds())} ago)"
+    return None
+
+
+def _merged_index(states: list[dict]) -> CalendarIndex:
+    """Merge the feed indexes, reusing the previous merge while none of them has changed."""
+    parts = tuple(state["index"] for state in states)
+    if len(parts) == 1:
+        return parts[0]
+    cached = _MERGED["parts"]
+    if len(cached) == len(parts) and all(a is b for a, b in zip(cached, parts)):
+        return _MERGED["index"]
+    index = CalendarIndex([ev for part in parts for ev in part.events])
+    _MERGED.update({"parts": parts, "index": index})
+    return index
+
+
+def merged_calendar() -> tuple[CalendarIndex, str]:
+    """Return the last good events of every feed and a status line without waiting on the network.
+
+    Only feeds that are cold with no saved copy on disk (first run, or a new feed URL) are
+    waited for, all fetched at once and for at most one fetch timeout; everything else is
+    served from the cached merge while background threads revalidate the stale feeds.
+    """
+    sources = calendar_sources()
+    if not sources:
+        return _EMPTY_INDEX, "No calendar feeds set (COZI_ICS_URL or SFO_CALENDAR_FEEDS)"
+
+    def is_cold(source: dict) -> bool:
+        state = _FEEDS.get(source["key"])
+        return state is None or state["url"] != source["url"] or state["checked_at"] is None
+
+    claimed: list[dict] = []
+    with _FEEDS_LOCK:
+        for source in sources:
+            if is_cold(source):
+                state = _FEEDS.setdefault(source["key"], _new_feed_state(source["url"]))
+                if not state["refreshing"]:
+                    state["refreshing"] = True
+                    claimed.append(source)
+                else:
+                    _count(source["key"], "coalesced")
+    for source in claimed:
+        # A saved copy warms the feed at once; either way the fetch runs alongside the others.
+        _load_snapshot(source)
+        _start_refresh(source)
+    with _FEEDS_LOCK:
+        # Bounded by the fetch timeout, so one slow cold feed cannot hold the page indefinitely.
+        _FEEDS_LOCK.wait_for(
+            lambda: not any(is_cold(s) and _FEEDS[s["key"]]["refreshing"] for s in sources),
+            timeout=_FETCH_TIMEOUT_SECONDS + 1,
+        )
+
+    now = datetime.now().astimezone()
+    expired: list[dict] = []
+    problems: list[str] = []
+    stale_age = None
+    with _FEEDS_LOCK:
+        states = []
+        for source in sources:
+            state = _FEEDS[source["key"]]
+            if state["url"] != source["url"]:
+                state = _new_feed_state(source["url"])
+            states.append(state)
+            checked_at = state["checked_at"]
+            if checked_at is None or (now - checked_at).total_seconds() >= source["ttl"]:
+                expired.append(source)
+                if state["fetched_at"] is not None:
+                    age = (now - state["fetched_at"]).total_seconds()
+                    stale_age = max(age, stale_age or 0)
+            problem = _feed_problem(source, state, now)
+            if problem:
+                problems.append(problem)
+        index = _merged_index(states)
+    for source in expired:
+        _revalidate_in_background(source)
+    if problems:
+        status = "; ".join(problems)
+    elif stale_age is not None:
+        status = f"OK ({len(index)} events, {_age_label(stale_age)} old, refreshing)"
+    else:
+        status = f"OK ({len(index)} events)"
+    return index, status
+
+
+def calendar_revision() -> str:
+    """Fingerprint of the events every feed is serving, the same in every worker.
+
+    Built from each feed's body digest and parse key, which identify its parsed events,
+    so workers that loaded the same bytes agree and a restart cannot repeat an old value.
+    """
+    parts = []
+    with _FEEDS_LOCK:
+        for source in calendar_sources():
+            state = _FEEDS.get(source["key"])
+            if state is None or state["url"] != source["url"]:
+                parts.append(f"{source['key']}:")
+                continue
+            parts.append(f"{source['key']}:{state['body_hash'] or ''}:{state['parse_key'] or ''}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def calendar_fetched_at() -> datetime | None:
+    """When the stalest loaded feed was last confirmed current."""
+    times = []
+    with _FEEDS_LOCK:
+        for source in calendar_sources():
+            state = _FEEDS.get(source["key"])
+            if state is not None and state["url"] == source["url"] and state["fetched_at"] is not None:
+                times.append(state["fetched_at"])
+    return min(times) if times else None
+
+
+def calendar_feed_stats() -> list[dict]:
+    """Refresh counters and cache state per configured feed, for the metrics endpoint.
+
+    `refreshes` counts fetches actually made; `coalesced` counts requests that found one
+    already in flight and were served the previous snapshot (or waited on it) instead.
+    """
+    feeds = []
+    with _FEEDS_LOCK:
+        for source in calendar_sources():
+            state = _FEEDS.get(source["key"])
+            if state is not None and state["url"] != source["url"]:
+                state = None
+            fetched_at = state["fetched_at"] if state else None
+            feeds.append(
+                {
+                    "key": source["key"],
+                    "name": source["name"],
+                    "ttl_seconds": source["ttl"],
+                    "events": len(state["index"]) if state else 0,
+                    "fetched_at": fetched_at.isoformat() if fetched_at else None,
+                    "refreshing": bool(state and state["refreshing"]),
+                    "error": state["error"] if state else None,
+                    **_STATS.get(source["key"], dict.fromkeys(_STAT_NAMES, 0)),
+                }
+            )
+    return feeds
+
+
+def calendar_events_for_day(target_date: date) -> tuple[list[dict], str]:
+    index, status = merged_calendar()
+    return index.on_day(target_date), status
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+from datetime import date, datetime, time
+
+from .calendar_feeds import event_color
+
+# Blocks shorter than this still get a readable box, so lanes are packed on the drawn extent.
+MIN_HEIGHT_PCT = 5
+
+
+class CalendarItem:
+    """One block or external event placed on a day column.
+
+    Slotted rather than a dict: a week view builds hundreds of these per request. Templates
+    read the same attribute names the old dicts used as keys.
+    """
+
+    __slots__ = (
+        "label",
+        "title",
+        "label_prefix",
+        "label_suffix",
+        "block_id",
+        "project",
+        "type",
+        "extra_class",
+        "color",
+        "is_all_day",
+        "start_min",
+        "end_min",
+        "start_display",
+        "end_display",
+        "top",
+        "height",
+        "lane",
+        "lanes",
+    )
+
+    def __init__(
+        self,
+        *,
+        label: str,
+        type: str,
+        start_min: int,
+        end_min: int,
+        start_display: str,
+        end_display: str = "",
+        title: str | None = None,
+        label_prefix: str | None = None,
+        label_suffix: str | None = None,
+        block_id: int | None = None,
+        project: str | None = None,
+        extra_class: str | None = None,
+        color: str | None = None,
+        is_all_day: bool = False,
+    ):
+        self.label = label
+        self.title = title
+        self.label_prefix = label_prefix
+        self.label_suffix = label_suffix
+        self.block_id = block_id
+        self.project = project
+        self.type = type
+        self.extra_class = extra_class
+        self.color = color
+        self.is_all_day = is_all_day
+        self.start_min = start_min
+        self.end_min = end_min
+        self.start_display = start_display
+        self.end_display = end_display
+        self.top = 0.0
+        self.height = 0.0
+        self.lane = 0
+        self.lanes = 1
+
+    @property
+    def time_label(self) -> str:
+        if self.is_all_day:
+            return "All day"
+        if self.end_display:
+            return f"{self.start_display} - {self.end_display}"
+        return self.start_display
+
+    def summary(self) -> dict:
+        """Fields the coach context carries for a calendar entry."""
+        return {
+            "label": self.label,
+            "start": self.start_display,
+            "end": self.end_display,
+            "type": self.type,
+            "project": self.project,
+            "block_id": self.block_id,
+        }
+
+
+def day_digest(items: list[CalendarItem]) -> str:
+    """Fingerprint of a laid-out day column, so clients only repaint columns that changed."""
+    digest = hashlib.sha1()
+    for item in items:
+        digest.update(repr(tuple(getattr(item, name) for name in CalendarItem.__slots__)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _display(value: time | datetime) -> str:
+    return value.strftime("%I:%M %p").lstrip("0")
+
+
+def block_item(block) -> CalendarItem | None:
+    """Item for a scheduled Block, or None when it has no start time to place it at."""
+    if not block.start_time:
+        return None
+    start_min = _minutes(block.start_time)
+    return CalendarItem(
+        label=block.title or block.block_type.value.title(),
+        title=block.title,
+        block_id=block.id,
+        project=block.project.title if block.project else None,
+        type=block.block_type.value,
+        start_min=start_min,
+        end_min=_minutes(block.end_time) if block.end_time else start_min + 30,
+        start_display=_display(block.start_time),
+        end_display=_display(block.end_time) if block.end_time else "",
+    )
+
+
+def feed_item(ev: dict, day: date, window_start: int = 0) -> CalendarItem:
+    """Item for an external calendar event on `day`; multi-day events are cut at midnight.
+
+    All-day events take the first hour of the visible window, starting at `window_start`.
+    """
+    start_dt = ev["start"]
+    end_dt = ev["end"]
+    is_all_day = bool(ev.get("is_all_day"))
+    if is_all_day:
+        start_min = window_start
+        end_min = window_start + 60
+        start_display = "All Day event"
+        end_display = ""
+    else:
+        start_min = _minutes(start_dt)
+        end_min = _minutes(end_dt)
+        start_display = _display(start_dt)
+        end_display = _display(end_dt)
+        if day > start_dt.date():
+            start_min = 0
+            start_display = "12:00 AM"
+        if day < end_dt.date():
+            end_min = 24 * 60
+            end_display = "11:59 PM"
+    # Colour-code by feed, or by label prefix where the feed maps one (e.g., Brynlee/Jessica)
+    color = event_color(ev)
+    classes = ["event-block--all-day" if is_all_day else "", "event-block--feed" if color else ""]
+    return CalendarItem(
+        label=ev["label"],
+        label_prefix=ev.get("label_prefix"),
+        label_suffix=ev.get("label_suffix"),
+        type="external",
+        start_min=start_min,
+        end_min=end_min,
+        start_display=start_display,
+        end_display=end_display,
+        extra_class=" ".join(c for c in classes if c) or None,
+        color=color,
+        is_all_day=is_all_day,
+    )
+
+
+def layout_day(items: list[CalendarItem], window_start: int, window_minutes: int) -> list[CalendarItem]:
+    """Position items inside the visible window and pack overlapping ones into side-by-side lanes.
+
+    Items wholly outside the window are dropped; the rest get `top`/`height` percentages and
+    `lane`/`lanes`. One sweep over the items sorted by start time: a min-heap of drawn end
+    positions frees lanes as items finish, and every run of transitively overlapping items
+    (a cluster) shares the lane count of its widest point. Returned in drawing order.
+    """
+    window_end = window_start + window_minutes
+    placed: list[tuple[float, float, CalendarItem]] = []
+    for item in items:
+        start = max(window_start, item.start_min)
+        end = min(window_end, item.end_min)
+        if end <= window_start or start >= window_end:
+            continue
+        item.top = max(0, (start - window_start) / window_minutes * 100)
+        item.height = max(MIN_HEIGHT_PCT, (end - start) / window_minutes * 100)
+        placed.append((item.top, item.top + item.height, item))
+    placed.sort(key=lambda entry: (entry[0], -entry[1]))
+
+    active: list[tuple[float, int]] = []  # (drawn end, lane) of items still on screen
+    free: list[int] = []
+    cluster: list[CalendarItem] = []
+    width = 0
+    for top, bottom, item in placed:
+        # Back-to-back items touch exactly; the epsilon absorbs float error in top + height.
+        while active and active[0][0] <= top + 1e-9:
+            heapq.heappush(free, heapq.heappop(active)[1])
+        if not active:
+            for member in cluster:
+                member.lanes = width
+            cluster, free, width = [], [], 0
+        item.lane = heapq.heappop(free) if free else width
+        width = max(width, item.lane + 1)
+        heapq.heappush(active, (bottom, item.lane))
+        cluster.append(item)
+    for member in cluster:
+        member.lanes = width
+    return [item for _, _, item in placed]
@@ -1,20 +1,55 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import random
-from datetime import date, datetime, time
-from typing import Any
-from urllib.error import URLError, HTTPError
-from urllib.request import Request as UrlRequest, urlopen
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from typing import Any, AsyncIterator
 
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, selectinload
-
-from ..models import Block, CoachMessage, Profile, Project, RitualEntry, Task, WaitingOn
+from starlette.concurrency import run_in_threadpool
+
+from ..db import ReadSessionLocal, SessionLocal, data_versions
+from ..models import Block, CoachContext, CoachConversation, CoachMessage, Profile, Project, RitualEntry, Task, WaitingOn
+from .llm import (
+    llm_circuit_open,
+    ollama_available,
+    ollama_chat,
+    ollama_chat_stream,
+    start_warmup,
+)
 
 _DEFAULT_QUOTE_CHANCE = 0.12
 _DEFAULT_HISTORY_LIMIT = 120
-_DEFAULT_LLM_TIMEOUT = 15
+_DEFAULT_CONTEXT_TOKENS = 1500
+_CHARS_PER_TOKEN = 4
+_OPEN_TASK_STATUSES = {"pending", "in_progress"}
+# Turns replayed verbatim to the LLM; anything older is folded into the rolling summary.
+# Folding waits for a batch, so turns not yet folded are replayed too (at most
+# LLM_HISTORY_TURNS + _SUMMARY_FOLD_BATCH - 1 messages).
+LLM_HISTORY_TURNS = 12
+_SUMMARY_FOLD_BATCH = 12
+_SUMMARY_FOLD_MAX = 200
+_SUMMARY_MAX_CHARS = 2000
+_SUMMARY_IN_FLIGHT: set[int] = set()
+# Tables read by collect_global_context; the cached snapshot is keyed on their data versions.
+_GLOBAL_CONTEXT_TABLES = ("profiles", "projects", "tasks", "blocks", "waiting_on", "ritual_entries")
+# in-memory cache of the serialised global context (lists block of the coach context)
+_GLOBAL_CONTEXT_CACHE: dict[str, Any] = {"versions": None, "data": None, "json": None, "etag": None}
+_GLOBAL_CONTEXT_LOCK = threading.Lock()
+# Screen contexts issued to recently rendered pages, keyed by content id (sha256 of the JSON).
+_RENDERED_CONTEXTS: OrderedDict[str, str] = OrderedDict()
+_RENDERED_CONTEXT_LIMIT = 256
+_RENDERED_CONTEXT_LOCK = threading.Lock()
+# Newly issued contexts waiting for the background flush to coach_contexts, so a send
+# served by another worker process can still resolve the id.
+_PENDING_CONTEXTS: dict[str, str] = {}
+_CONTEXT_FLUSH = {"running": False}
 
 
 def _to_iso(value: date | datetime | time | None) -> str | None:
@@ -172,6 +207,113 @@ def collect_global_context(db: Session) -> dict[str, Any]:
     }
 
 
+def _dump_context_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=True, default=_json_default)
+
+
+def _refresh_global_context(db: Session) -> dict[str, Any]:
+    # Read versions before querying so a concurrent commit leaves the snapshot stale, not wrong.
+    versions = data_versions(db, *_GLOBAL_CONTEXT_TABLES)
+    with _GLOBAL_CONTEXT_LOCK:
+        if _GLOBAL_CONTEXT_CACHE["versions"] == versions and _GLOBAL_CONTEXT_CACHE["json"]:
+            return dict(_GLOBAL_CONTEXT_CACHE)
+
+    data = collect_global_context(db)
+    payload = _dump_context_json(data)
+    etag = f'"{hashlib.sha1(payload.encode("ascii")).hexdigest()}"'
+    with _GLOBAL_CONTEXT_LOCK:
+        _GLOBAL_CONTEXT_CACHE.update({"versions": versions, "data": data, "json": payload, "etag": etag})
+        return dict(_GLOBAL_CONTEXT_CACHE)
+
+
+def global_context_snapshot(db: Session) -> tuple[str, str]:
+    """Return the serialised global context and its ETag, rebuilding only when its tables changed."""
+    entry = _refresh_global_context(db)
+    return entry["json"], entry["etag"]
+
+
+def cached_global_context(db: Session) -> dict[str, Any]:
+    """Return the cached global context dict; callers must treat it as read-only."""
+    return _refresh_global_context(db)["data"]
+
+
+def context_id_for(context_json: str) -> str:
+    return hashlib.sha256(context_json.encode("utf-8")).hexdigest()
+
+
+def persist_context(db: Session, context_id: str, context_json: str) -> None:
+    # Ids are content hashes, so a concurrent writer may store the same row first; keep either copy.
+    db.execute(
+        insert(CoachContext)
+        .values(id=context_id, context_json=context_json)
+        .on_conflict_do_nothing(index_elements=[CoachContext.id])
+    )
+
+
+def _flush_rendered_contexts() -> None:
+    try:
+        while True:
+            with _RENDERED_CONTEXT_LOCK:
+                batch = dict(_PENDING_CONTEXTS)
+                _PENDING_CONTEXTS.clear()
+            if not batch:
+                return
+            try:
+                with SessionLocal() as db:
+                    for context_id, context_json in batch.items():
+                        persist_context(db, context_id, context_json)
+                    db.commit()
+            except SQLAlchemyError:
+                # Best effort: a send that misses the row gets a 409 and resends the full context.
+                pass
+    finally:
+        with _RENDERED_CONTEXT_LOCK:
+            _CONTEXT_FLUSH["running"] = False
+            restart = bool(_PENDING_CONTEXTS)
+        if restart:
+            _start_context_flush()
+
+
+def _start_context_flush() -> None:
+    with _RENDERED_CONTEXT_LOCK:
+        if _CONTEXT_FLUSH["running"]:
+            return
+        _CONTEXT_FLUSH["running"] = True
+    # Off the request thread: pages render on read sessions and must not queue on the writer.
+    threading.Thread(target=_flush_rendered_contexts, name="coach-context-flush", daemon=True).start()
+
+
+def remember_context(context_json: str) -> str:
+    """Register a rendered screen context and return its content id.
+
+    Ids new to this process are also written to coach_contexts in the background, so
+    /coach/message can resolve them from any worker.
+    """
+    context_id = context_id_for(context_json)
+    with _RENDERED_CONTEXT_LOCK:
+        issued = context_id not in _RENDERED_CONTEXTS
+        if issued:
+            _PENDING_CONTEXTS[context_id] = context_json
+        _RENDERED_CONTEXTS[context_id] = context_json
+        _RENDERED_CONTEXTS.move_to_end(context_id)
+        while len(_RENDERED_CONTEXTS) > _RENDERED_CONTEXT_LIMIT:
+            _RENDERED_CONTEXTS.popitem(last=False)
+    if issued:
+        _start_context_flush()
+    return context_id
+
+
+def recall_context(context_id: str) -> str | None:
+    with _RENDERED_CONTEXT_LOCK:
+        return _RENDERED_CONTEXTS.get(context_id)
+
+
+def screen_context_json(context: dict[str, Any]) -> str:
+    """Serialise the stable part of a screen context (no lists, no render timestamp)."""
+    stable = {key: value for key, value in context.items() if key in ("screen", "screen_data")}
+    return _dump_context_json(stable)
+
+
 def build_coach_context(
     *,
     request_path: str,
@@ -198,17 +340,24 @@ def build_coach_context_json(
     screen_id: str,
     screen_title: str,
     screen_data: dict[str, Any],
-    db: Session,
 ) -> str:
+    """Serialise the per-page coach context; the global lists are fetched lazily via /coach/context."""
     context = build_coach_context(
         request_path=request_path,
         screen_id=screen_id,
         screen_title=screen_title,
         screen_data=screen_data,
-        global_context=collect_global_context(db),
+        global_context={},
     )
-    payload = json.dumps(context, ensure_ascii=True, default=_json_default)
-    return payload.replace("</", "<\\/")
+    context_id = remember_context(screen_context_json(context))
+    # The page gets the same context plus its handle, so /coach/message only needs the id.
+    page = {
+        "screen": context["screen"],
+        "screen_data": context["screen_data"],
+        "context_id": context_id,
+        "generated_at": context["generated_at"],
+    }
+    return _dump_context_json(page).replace("</", "<\\/")
 
 
 def _quote_bank() -> list[str]:
@@ -527,31 +676,221 @@ def _llm_provider() -> str:
     return os.getenv("SFO_LLM_PROVIDER", "auto").strip().lower()
 
 
-def _ollama_url() -> str:
-    return os.getenv("SFO_OLLAMA_URL", "http://localhost:11434").rstrip("/")
-
-
-def _ollama_model() -> str:
-    return os.getenv("SFO_OLLAMA_MODEL", "llama3.1:8b").strip()
-
-
-def _llm_timeout() -> int:
-    raw = os.getenv("SFO_LLM_TIMEOUT")
+def _context_token_budget() -> int:
+    raw = os.getenv("SFO_COACH_CONTEXT_TOKENS")
     if raw and raw.isdigit():
         return int(raw)
-    return _DEFAULT_LLM_TIMEOUT
+    return _DEFAULT_CONTEXT_TOKENS
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+def _fit_items(items: list[Any], budget: int) -> tuple[list[Any], int]:
+    """Take items in order until the token budget runs out; return (kept, tokens used)."""
+    kept: list[Any] = []
+    used = 0
+    for item in items:
+        cost = _estimate_tokens(_dump_context_json(item)) + 1
+        if used + cost > budget:
+            break
+        kept.append(item)
+        used += cost
+    return kept, used
+
+
+def _fit_section(value: Any, budget: int) -> tuple[Any, int, int]:
+    """Shrink a section to the budget; return (value or None, tokens used, items omitted)."""
+    if budget <= 0:
+        return None, 0, len(value) if isinstance(value, list) else 1
+    cost = _estimate_tokens(_dump_context_json(value))
+    if cost <= budget:
+        return value, cost, 0
+    if isinstance(value, list):
+        kept, used = _fit_items(value, budget)
+        return kept, used, len(value) - len(kept)
+    if isinstance(value, dict):
+        fitted: dict[str, Any] = {}
+        used = 2
+        omitted = 0
+        # Scalars first (ids, dates, status text), then trim lists with what remains.
+        for key, item in sorted(value.items(), key=lambda kv: isinstance(kv[1], (list, dict))):
+            part, part_used, part_omitted = _fit_section(item, budget - used - _estimate_tokens(key))
+            omitted += part_omitted
+            if part is None:
+                continue
+            fitted[key] = part
+            used += part_used + _estimate_tokens(key)
+        return fitted, used, omitted
+    return None, 0, 1
+
+
+def pack_context(context: dict[str, Any] | None, budget: int | None = None) -> str | None:
+    """Rank and trim the coach context to a token budget for the LLM prompt.
+
+    Screen data goes first, then profile, today/week tasks, this week's blocks, active
+    projects, and waiting items. Anything that does not fit is reported as counts only.
+    """
+    if not context:
+        return None
+    budget = budget if budget is not None else _context_token_budget()
+    lists = context.get("lists") or {}
+    today = date.today()
+    week_end = (today + timedelta(days=6)).isoformat()
+    open_tasks = [t for t in lists.get("tasks", []) if t.get("status") in _OPEN_TASK_STATUSES]
+
+    packed: dict[str, Any] = {
+        "screen": context.get("screen"),
+        "counts": _summarize_counts(context),
+    }
+    used = _estimate_tokens(_dump_context_json(packed))
+    # (key, value, max share of the budget); unused share flows on to later sections.
+    sections = [
+        ("screen_data", context.get("screen_data"), 0.45),
+        ("profile", lists.get("profile"), 0.1),
+        ("today_tasks", [t for t in open_tasks if t.get("when_bucket") == "today"], 0.2),
+        ("week_tasks", [t for t in open_tasks if t.get("when_bucket") == "week"], 0.15),
+        (
+            "week_blocks",
+            sorted(
+                (b for b in lists.get("blocks", []) if today.isoformat() <= (b.get("date") or "") <= week_end),
+                key=lambda b: (b.get("date") or "", b.get("start_time") or ""),
+            ),
+            0.15,
+        ),
+        ("active_projects", [p for p in lists.get("projects", []) if p.get("active_this_week")], 0.1),
+        ("waiting_on", lists.get("waiting_on", []), 0.05),
+    ]
+    reserved = sum(share for _, value, share in sections if value)
+    omitted: dict[str, int] = {}
+    for key, value, share in sections:
+        if not value:
+            continue
+        remaining = budget - used - _estimate_tokens(key)
+        allowance = min(remaining, int(remaining * share / reserved)) if reserved else remaining
+        reserved -= share
+        fitted, section_used, section_omitted = _fit_section(value, allowance)
+        if section_omitted:
+            omitted[key] = section_omitted
+        if fitted:
+            packed[key] = fitted
+            used += section_used + _estimate_tokens(key)
+    if omitted:
+        packed["omitted"] = omitted
+    return _dump_context_json(packed)
+
+
+def load_history_tail(db: Session, convo: CoachConversation) -> list[CoachMessage]:
+    """Return the messages the summary does not cover yet, oldest first.
+
+    That is at least the newest LLM_HISTORY_TURNS, plus any older turns still waiting
+    for a fold batch, so nothing falls between the summary and the replayed tail. A longer
+    backlog (a conversation from before summaries) is folded when the coach panel loads
+    its history, before the first send needs it.
+    """
+    query = db.query(CoachMessage).filter(CoachMessage.conversation_id == convo.id)
+    if convo.summary_through_id:
+        query = query.filter(CoachMessage.id > convo.summary_through_id)
+    limit = LLM_HISTORY_TURNS + _SUMMARY_FOLD_BATCH - 1
+    rows = query.order_by(CoachMessage.id.desc()).limit(limit).all()
+    return list(reversed(rows))
+
+
+def _turns_to_fold(db: Session, convo: CoachConversation) -> list[CoachMessage]:
+    # Keyset on id: everything after the last summarised message and before the prompt tail.
+    tail_start = (
+        db.query(CoachMessage.id)
+        .filter(CoachMessage.conversation_id == convo.id)
+        .order_by(CoachMessage.id.desc())
+        .offset(LLM_HISTORY_TURNS - 1)
+        .limit(1)
+        .scalar()
+    )
+    if tail_start is None:
+        return []
+    query = db.query(CoachMessage).filter(
+        CoachMessage.conversation_id == convo.id,
+        CoachMessage.id < tail_start,
+    )
+    if convo.summary_through_id:
+        query = query.filter(CoachMessage.id > convo.summary_through_id)
+    return query.order_by(CoachMessage.id.asc()).limit(_SUMMARY_FOLD_MAX).all()
+
+
+def _extractive_summary(previous: str | None, turns: list[CoachMessage]) -> str:
+    lines = [previous] if previous else []
+    for msg in turns:
+        if msg.role != "user":
+            continue
+        text = " ".join((msg.content or "").split())
+        if text:
+            lines.append(f"- User raised: {text[:160]}")
+    summary = "\n".join(lines)
+    # Keep the most recent material when trimming.
+    return summary[-_SUMMARY_MAX_CHARS:]
+
+
+async def _llm_summary(previous: str | None, turns: list[CoachMessage]) -> str | None:
+    if _llm_provider() not in {"ollama", "auto"} or not await ollama_available():
+        return None
+    transcript = "\n".join(f"{msg.role}: {msg.content}" for msg in turns)
+    prompt = (
+        "Update the running summary of a coaching chat. Keep the user's goals, commitments, "
+        "recurring struggles, and decisions; drop small talk. Plain prose, under 150 words.\n\n"
+        f"Current summary:\n{previous or '(none)'}\n\nNew turns:\n{transcript}"
+    )
+    try:
+        summary = await ollama_chat([{"role": "user", "content": prompt}])
+    except Exception:
+        return None
+    return summary[:_SUMMARY_MAX_CHARS] or None
 
 
-def _ollama_available() -> bool:
-    url = f"{_ollama_url()}/api/tags"
+async def refresh_conversation_summary(conversation_id: int) -> None:
+    """Fold turns older than the prompt tail into the conversation's persisted summary."""
+    if conversation_id in _SUMMARY_IN_FLIGHT:
+        return
+    _SUMMARY_IN_FLIGHT.add(conversation_id)
     try:
-        req = UrlRequest(url, headers={"Accept": "application/json"})
-        with urlopen(req, timeout=2) as resp:
-            if resp.status != 200:
-                return False
-        return True
-    except Exception:
+        await _fold_conversation(conversation_id)
+    finally:
+        _SUMMARY_IN_FLIGHT.discard(conversation_id)
+
+
+async def _fold_conversation(conversation_id: int) -> None:
+    # A conversation from before summaries existed can be far more than _SUMMARY_FOLD_MAX
+    # turns behind, so keep folding until less than a batch is left.
+    while await _fold_once(conversation_id):
+        pass
+
+
+async def _fold_once(conversation_id: int) -> bool:
+    def load() -> tuple[str | None, list[CoachMessage]]:
+        with ReadSessionLocal() as db:
+            convo = db.get(CoachConversation, conversation_id)
+            if convo is None:
+                return None, []
+            turns = _turns_to_fold(db, convo)
+            db.expunge_all()
+            return convo.summary, turns
+
+    previous, turns = await run_in_threadpool(load)
+    if len(turns) < _SUMMARY_FOLD_BATCH:
         return False
+    summary = await _llm_summary(previous, turns) or _extractive_summary(previous, turns)
+
+    def save() -> None:
+        with SessionLocal() as db:
+            convo = db.get(CoachConversation, conversation_id)
+            if convo is None:
+                return
+            convo.summary = summary
+            convo.summary_through_id = turns[-1].id
+            db.commit()
+
+    await run_in_threadpool(save)
+    return len(turns) == _SUMMARY_FOLD_MAX
 
 
 def _build_llm_messages(
@@ -559,14 +898,14 @@ def _build_llm_messages(
     history: list[CoachMessage],
     new_message: str,
     context_json: str | None,
+    summary: str | None = None,
 ) -> list[dict[str, str]]:
+    # Context rides on the newest turn only; earlier turns carry just their text.
     messages = [{"role": "system", "content": system_prompt}]
-    recent = history[-12:] if history else []
-    for msg in recent:
-        content = msg.content
-        if msg.role == "user" and msg.context_json:
-            content = f"{content}\n\nContext:\n{msg.context_json}"
-        messages.append({"role": msg.role, "content": content})
+    if summary:
+        messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+    for msg in history:
+        messages.append({"role": msg.role, "content": msg.content})
     if context_json:
         composed = f"{new_message}\n\nContext:\n{context_json}"
     else:
@@ -595,56 +934,90 @@ def _system_prompt() -> str:
     )
 
 
-def _call_ollama(messages: list[dict[str, str]]) -> str:
-    url = f"{_ollama_url()}/api/chat"
-    payload = {
-        "model": _ollama_model(),
-        "messages": messages,
-        "stream": False,
-        "options": {
-            "temperature": 0.6,
-            "top_p": 0.9,
-        },
-    }
-    data = json.dumps(payload).encode("utf-8")
-    req = UrlRequest(url, data=data, headers={"Content-Type": "application/json"})
-    with urlopen(req, timeout=_llm_timeout()) as resp:
-        body = resp.read()
-    parsed = json.loads(body)
-    return (parsed.get("message") or {}).get("content", "").strip()
+async def start_coach_warmup() -> None:
+    """Startup hook: keep the coach model loaded with the system prompt already cached."""
+    if _llm_provider() in {"ollama", "auto"}:
+        start_warmup([{"role": "system", "content": _system_prompt()}])
 
 
-def generate_coach_reply(
+async def _lite_reply_without_llm(message: str, context: dict[str, Any] | None) -> str | None:
+    """Return a coach-lite reply when the LLM should not be used, otherwise None."""
+    provider = _llm_provider()
+    if _is_guide_request(message):
+        return coach_help_reply(context)
+    if provider not in {"ollama", "auto"}:
+        return coach_lite_reply(message, context)
+    if provider == "auto" and not await ollama_available():
+        return coach_lite_reply(message, context)
+    if provider == "ollama" and llm_circuit_open():
+        # Recent failures: answer instantly while the breaker's background probe waits it out.
+        await ollama_available()
+        return coach_lite_reply(message, context)
+    return None
+
+
+async def generate_coach_reply(
     *,
     message: str,
     context: dict[str, Any] | None,
     history: list[CoachMessage],
-) -> tuple[str, list[dict[str, str]], str]:
-    provider = _llm_provider()
-    context_json = json.dumps(context, ensure_ascii=True, default=_json_default) if context else None
+    summary: str | None = None,
+) -> tuple[str, list[dict[str, str]], str, dict[str, Any]]:
+    """Return (reply, actions, engine, meta); meta carries LLM latency when Ollama answered."""
     actions = suggest_quick_actions(context)
 
-    if _is_guide_request(message):
-        return coach_help_reply(context), actions, "coach-lite"
-
-    if provider == "off":
-        return coach_lite_reply(message, context), actions, "coach-lite"
-
-    if provider == "auto" and not _ollama_available():
-        return coach_lite_reply(message, context), actions, "coach-lite"
-
-    if provider in {"ollama", "auto"}:
-        try:
-            messages = _build_llm_messages(_system_prompt(), history, message, context_json)
-            reply = _call_ollama(messages)
-            if reply:
-                return reply, actions, "ollama"
-        except (URLError, HTTPError, TimeoutError, ValueError):
-            pass
-        except Exception:
-            pass
-
-    return coach_lite_reply(message, context), actions, "coach-lite"
+    lite_reply = await _lite_reply_without_llm(message, context)
+    if lite_reply is not None:
+        return lite_reply, actions, "coach-lite", {}
+
+    meta: dict[str, Any] = {}
+    try:
+        messages = _build_llm_messages(
+            _system_prompt(), history, message, pack_context(context), summary
+        )
+        reply = await ollama_chat(messages, stats=meta)
+        if reply:
+            return reply, actions, "ollama", meta
+    except Exception:
+        pass
+
+    return coach_lite_reply(message, context), actions, "coach-lite", {}
+
+
+async def stream_coach_reply(
+    *,
+    message: str,
+    context: dict[str, Any] | None,
+    history: list[CoachMessage],
+    summary: str | None = None,
+) -> AsyncIterator[tuple[str, Any]]:
+    """Yield ("delta", text) chunks of the reply, then ("meta", latency dict) and ("engine", name)."""
+    lite_reply = await _lite_reply_without_llm(message, context)
+    if lite_reply is not None:
+        yield "delta", lite_reply
+        yield "meta", {}
+        yield "engine", "coach-lite"
+        return
+
+    streamed = False
+    meta: dict[str, Any] = {}
+    try:
+        messages = _build_llm_messages(
+            _system_prompt(), history, message, pack_context(context), summary
+        )
+        async for chunk in ollama_chat_stream(messages, stats=meta):
+            streamed = True
+            yield "delta", chunk
+    except Exception:
+        # Once text has reached the user, keep the partial reply rather than switching voice.
+        pass
+    if streamed:
+        yield "meta", meta
+        yield "engine", "ollama"
+        return
+    yield "delta", coach_lite_reply(message, context)
+    yield "meta", {}
+    yield "engine", "coach-lite"
 
 
 def suggest_quick_actions(context: dict[str, Any] | None) -> list[dict[str, str]]:
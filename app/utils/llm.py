@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator
+
+import httpx
+
+_DEFAULT_LLM_TIMEOUT = 15
+_DEFAULT_MAX_CONNECTIONS = 4
+_DEFAULT_CONCURRENCY = 2
+_DEFAULT_KEEPALIVE_SECONDS = 60
+_PROBE_TIMEOUT_SECONDS = 2.0
+_CHAT_OPTIONS = {"temperature": 0.6, "top_p": 0.9}
+_DEFAULT_PROBE_TTL_SECONDS = 30
+_DEFAULT_BREAKER_THRESHOLD = 3
+_DEFAULT_BREAKER_COOLDOWN_SECONDS = 30
+_DEFAULT_KEEP_ALIVE = "30m"
+_DEFAULT_WARM_INTERVAL_SECONDS = 600
+_WARM_RETRY_SECONDS = 5
+_COLD_LOAD_MS = 250
+
+# One pooled client per event loop; connections are kept alive between coach messages.
+_CLIENT_STATE: dict[str, Any] = {"loop": None, "client": None, "semaphore": None}
+
+
+# Circuit breaker over the provider: "closed" (healthy), "open" (skip the LLM until the
+# cooldown ends), "half_open" (a background probe decides whether to close again).
+_HEALTH: dict[str, Any] = {
+    "state": "closed",
+    "failures": 0,
+    "opened_at": 0.0,
+    "available": None,
+    "checked_at": 0.0,
+    "probe": None,
+}
+
+
+# Warm-up keeps the model (and the KV cache for the shared system prompt) resident in Ollama.
+_WARM: dict[str, Any] = {"task": None, "last_used": 0.0}
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw and raw.isdigit() and int(raw) > 0:
+        return int(raw)
+    return default
+
+
+def ollama_url() -> str:
+    return os.getenv("SFO_OLLAMA_URL", "http://localhost:11434").rstrip("/")
+
+
+def ollama_model() -> str:
+    return os.getenv("SFO_OLLAMA_MODEL", "llama3.1:8b").strip()
+
+
+def llm_timeout() -> int:
+    return _env_int("SFO_LLM_TIMEOUT", _DEFAULT_LLM_TIMEOUT)
+
+
+def keep_alive() -> str | int:
+    raw = os.getenv("SFO_OLLAMA_KEEP_ALIVE", _DEFAULT_KEEP_ALIVE).strip() or _DEFAULT_KEEP_ALIVE
+    # Ollama takes plain numbers as seconds (-1 keeps the model loaded indefinitely).
+    return int(raw) if raw.lstrip("-").isdigit() else raw
+
+
+def _warm_interval() -> int:
+    raw = os.getenv("SFO_LLM_WARM_INTERVAL")
+    if raw is not None and raw.strip().isdigit():
+        return int(raw.strip())
+    return _DEFAULT_WARM_INTERVAL_SECONDS
+
+
+def _client() -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    loop = asyncio.get_running_loop()
+    if _CLIENT_STATE["client"] is None or _CLIENT_STATE["loop"] is not loop:
+        limits = httpx.Limits(
+            max_connections=_env_int("SFO_LLM_MAX_CONNECTIONS", _DEFAULT_MAX_CONNECTIONS),
+            max_keepalive_connections=_env_int("SFO_LLM_MAX_CONNECTIONS", _DEFAULT_MAX_CONNECTIONS),
+            keepalive_expiry=_DEFAULT_KEEPALIVE_SECONDS,
+        )
+        _CLIENT_STATE["client"] = httpx.AsyncClient(
+            base_url=ollama_url(),
+            limits=limits,
+            timeout=httpx.Timeout(llm_timeout(), connect=_PROBE_TIMEOUT_SECONDS),
+        )
+        _CLIENT_STATE["semaphore"] = asyncio.Semaphore(
+            _env_int("SFO_LLM_CONCURRENCY", _DEFAULT_CONCURRENCY)
+        )
+        _CLIENT_STATE["loop"] = loop
+    return _CLIENT_STATE["client"], _CLIENT_STATE["semaphore"]
+
+
+async def close_llm_client() -> None:
+    client = _CLIENT_STATE["client"]
+    _CLIENT_STATE.update({"loop": None, "client": None, "semaphore": None})
+    task = _WARM["task"]
+    _WARM["task"] = None
+    if task is not None and not task.done():
+        task.cancel()
+    if client is not None:
+        await client.aclose()
+
+
+def _chat_payload(messages: list[dict[str, str]], *, stream: bool) -> dict[str, Any]:
+    return {
+        "model": ollama_model(),
+        "messages": messages,
+        "stream": stream,
+        "keep_alive": keep_alive(),
+        "options": dict(_CHAT_OPTIONS),
+    }
+
+
+def _record_timing(stats: dict[str, Any] | None, parsed: dict[str, Any], started: float) -> None:
+    _WARM["last_used"] = time.monotonic()
+    if stats is None:
+        return
+    # Ollama reports durations in nanoseconds; load_duration is the model load, ~0 when warm.
+    load_ms = int((parsed.get("load_duration") or 0) / 1_000_000)
+    stats["load_ms"] = load_ms
+    stats["total_ms"] = int((time.monotonic() - started) * 1000)
+    stats["model_state"] = "cold" if load_ms >= _COLD_LOAD_MS else "warm"
+
+
+def _record_success() -> None:
+    _HEALTH.update(
+        {"state": "closed", "failures": 0, "available": True, "checked_at": time.monotonic()}
+    )
+
+
+def _record_failure(*, trip: bool = False) -> None:
+    now = time.monotonic()
+    _HEALTH["failures"] += 1
+    _HEALTH["checked_at"] = now
+    threshold = _env_int("SFO_LLM_BREAKER_THRESHOLD", _DEFAULT_BREAKER_THRESHOLD)
+    if trip or _HEALTH["state"] == "half_open" or _HEALTH["failures"] >= threshold:
+        _HEALTH.update({"state": "open", "opened_at": now, "available": False})
+
+
+async def _probe() -> bool:
+    client, _ = _client()
+    try:
+        resp = await client.get(
+            "/api/tags",
+            headers={"Accept": "application/json"},
+            timeout=_PROBE_TIMEOUT_SECONDS,
+        )
+        healthy = resp.status_code == 200
+    except Exception:
+        healthy = False
+    if healthy:
+        _record_success()
+    else:
+        # A failed probe means the server is down, not merely slow: open straight away.
+        _record_failure(trip=True)
+    return healthy
+
+
+def _schedule_probe() -> None:
+    loop = asyncio.get_running_loop()
+    task = _HEALTH["probe"]
+    if task is not None and not task.done() and task.get_loop() is loop:
+        return
+    _HEALTH["probe"] = loop.create_task(_probe())
+
+
+async def ollama_available() -> bool:
+    """Cached provider health; only the very first check waits on the network."""
+    now = time.monotonic()
+    if _HEALTH["state"] == "open":
+        cooldown = _env_int("SFO_LLM_BREAKER_COOLDOWN", _DEFAULT_BREAKER_COOLDOWN_SECONDS)
+        if now - _HEALTH["opened_at"] >= cooldown:
+            _HEALTH["state"] = "half_open"
+            _schedule_probe()
+        return False
+    if _HEALTH["state"] == "half_open":
+        _schedule_probe()
+        return False
+    if _HEALTH["available"] is None:
+        return await _probe()
+    if now - _HEALTH["checked_at"] >= _env_int("SFO_LLM_PROBE_TTL", _DEFAULT_PROBE_TTL_SECONDS):
+        _schedule_probe()
+    return bool(_HEALTH["available"])
+
+
+def llm_circuit_open() -> bool:
+    return _HEALTH["state"] != "closed"
+
+
+async def warm_model(prefix: list[dict[str, str]]) -> dict[str, Any]:
+    """Load the model and prime its prompt cache with `prefix` (normally the system prompt)."""
+    client, semaphore = _client()
+    payload = _chat_payload(prefix, stream=False)
+    payload["options"]["num_predict"] = 1
+    stats: dict[str, Any] = {}
+    started = time.monotonic()
+    try:
+        async with semaphore:
+            resp = await client.post("/api/chat", json=payload)
+        resp.raise_for_status()
+        parsed = resp.json()
+    except Exception:
+        _record_failure()
+        raise
+    _record_success()
+    _record_timing(stats, parsed, started)
+    return stats
+
+
+async def _warm_loop(prefix: list[dict[str, str]]) -> None:
+    interval = _warm_interval()
+    failures = 0
+    while True:
+        idle = time.monotonic() - _WARM["last_used"]
+        if idle >= interval:
+            try:
+                if await ollama_available():
+                    await warm_model(prefix)
+                    failures = 0
+            except Exception:
+                # Back off (up to the interval) so a missing model is not re-posted every few seconds.
+                failures += 1
+                await asyncio.sleep(min(interval, _WARM_RETRY_SECONDS * 2 ** min(failures, 10)))
+                continue
+            idle = time.monotonic() - _WARM["last_used"]
+        await asyncio.sleep(max(5.0, interval - idle))
+
+
+def start_warmup(prefix: list[dict[str, str]]) -> None:
+    """Warm the model now and again whenever it has sat idle for SFO_LLM_WARM_INTERVAL seconds."""
+    if _warm_interval() <= 0:
+        return
+    task = _WARM["task"]
+    if task is not None and not task.done():
+        return
+    _WARM["task"] = asyncio.get_running_loop().create_task(_warm_loop(prefix))
+
+
+async def ollama_chat(messages: list[dict[str, str]], stats: dict[str, Any] | None = None) -> str:
+    client, semaphore = _client()
+    started = time.monotonic()
+    try:
+        async with semaphore:
+            resp = await client.post("/api/chat", json=_chat_payload(messages, stream=False))
+        resp.raise_for_status()
+        parsed = resp.json()
+    except Exception:
+        _record_failure()
+        raise
+    _record_success()
+    _record_timing(stats, parsed, started)
+    return (parsed.get("message") or {}).get("content", "").strip()
+
+
+async def ollama_chat_stream(
+    messages: list[dict[str, str]], stats: dict[str, Any] | None = None
+) -> AsyncIterator[str]:
+    """Yield reply chunks from Ollama's NDJSON stream as they arrive."""
+    client, semaphore = _client()
+    started = time.monotonic()
+    # The read timeout applies per chunk, so it bounds gaps between tokens, not the whole reply.
+    try:
+        async with semaphore:
+            async with client.stream("POST", "/api/chat", json=_chat_payload(messages, stream=True)) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    line = line.strip()
+                    if not line:
+                        continue
+                    parsed = json.loads(line)
+                    chunk = (parsed.get("message") or {}).get("content", "")
+                    if chunk:
+                        if stats is not None and "first_token_ms" not in stats:
+                            stats["first_token_ms"] = int((time.monotonic() - started) * 1000)
+                        yield chunk
+                    if parsed.get("done"):
+                        _record_timing(stats, parsed, started)
+                        break
+    except Exception:
+        _record_failure()
+        raise
+    _record_success()
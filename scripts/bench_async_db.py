@@ -0,0 +1,86 @@
+"""Latency of hot pages while slow calls hold the threadpool, with and without SFO_ASYNC_DB.
+
+    python scripts/bench_async_db.py [requests] [blockers]
+
+Simulates slow Cozi/Ollama work by parking `blockers` one-second sleeps in Starlette's
+threadpool (capped at 8 workers here), then fires `requests` concurrent GETs at /nudges,
+/coach/history and /health, and reports each path. On the sync path they all queue behind
+the sleepers. On the async path the queries await aiosqlite, so the JSON endpoints answer
+at once, but /health still renders its template in the threadpool and waits like before.
+Needs aiosqlite; runs in a scratch directory.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+# The engine opens ./sfo.db and the app serves ./app/static, both relative to the cwd.
+_scratch = Path(tempfile.mkdtemp(prefix="sfo-async-"))
+(_scratch / "app").symlink_to(REPO_ROOT / "app")
+os.chdir(_scratch)
+for _name in ("SFO_PASSWORD", "SFO_API_TOKEN", "COZI_ICS_URL", "SFO_CALENDAR_FEEDS"):
+    os.environ[_name] = ""
+
+import anyio.to_thread  # noqa: E402
+import httpx  # noqa: E402
+from starlette.concurrency import run_in_threadpool  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.db import SessionLocal, close_async_db  # noqa: E402
+from app.models import Task  # noqa: E402
+
+THREADPOOL_SIZE = 8
+PATHS = ("/nudges", "/coach/history", "/health")
+
+
+async def _round(app, requests: int, blockers: int) -> list[tuple[str, float]]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def fetch(path: str) -> tuple[str, float]:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            return path, (time.perf_counter() - started) * 1000
+
+        sleepers = [asyncio.ensure_future(run_in_threadpool(time.sleep, 1.0)) for _ in range(blockers)]
+        await asyncio.sleep(0.05)  # let the sleepers take their threads first
+        latencies = await asyncio.gather(*(fetch(PATHS[i % len(PATHS)]) for i in range(requests)))
+        await asyncio.gather(*sleepers)
+    return list(latencies)
+
+
+async def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    blockers = int(sys.argv[2]) if len(sys.argv) > 2 else THREADPOOL_SIZE
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    app = create_app()
+    with SessionLocal() as db:
+        db.add_all(Task(verb_noun=f"Task {i}") for i in range(300))
+        db.commit()
+
+    print(f"{requests} requests, {blockers} one-second blockers, {THREADPOOL_SIZE} threadpool workers")
+    print(f"{'db':<6} {'path':<15} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for flag in ("", "1"):
+        os.environ["SFO_ASYNC_DB"] = flag
+        await _round(app, 4, 0)  # warm templates and the connection pool
+        results = await _round(app, requests, blockers)
+        label = "async" if flag else "sync"
+        for path in PATHS:
+            latencies = sorted(ms for p, ms in results if p == path)
+            p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+            print(
+                f"{label:<6} {path:<15} {statistics.median(latencies):>8.0f} {p95:>8.0f} {latencies[-1]:>8.0f}"
+            )
+    await close_async_db()  # pooled aiosqlite connections each keep a thread alive
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""Benchmark the calendar layout engine over thousands of overlapping events.
+
+    python scripts/bench_calendar_layout.py [events-per-day] [days]
+
+Run from the repo root. Prints per-day and total layout time, plus the widest lane count
+seen, so regressions in the sweep (for instance an accidental quadratic overlap check)
+show up as times growing faster than the event count.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.calendar_layout import feed_item, layout_day  # noqa: E402
+
+WINDOW_START = 6 * 60
+WINDOW_MINUTES = 17 * 60
+
+
+def _events(day: date, count: int, rng: random.Random) -> list[dict]:
+    events = []
+    for i in range(count):
+        start = datetime.combine(day, datetime.min.time()) + timedelta(minutes=rng.randrange(5 * 60, 23 * 60, 5))
+        end = start + timedelta(minutes=rng.choice((15, 30, 45, 60, 90, 120, 240)))
+        events.append(
+            {
+                "label": f"Event {i}",
+                "start": start,
+                "end": end,
+                "is_all_day": rng.random() < 0.02,
+                "source": "bench",
+            }
+        )
+    return events
+
+
+def main() -> None:
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    rng = random.Random(42)
+    today = date.today()
+    feeds = [(today + timedelta(days=d), _events(today + timedelta(days=d), per_day, rng)) for d in range(days)]
+
+    widest = 0
+    started = time.perf_counter()
+    for day, events in feeds:
+        items = layout_day([feed_item(ev, day, WINDOW_START) for ev in events], WINDOW_START, WINDOW_MINUTES)
+        widest = max([widest, *(item.lanes for item in items)])
+    elapsed = time.perf_counter() - started
+    total = per_day * days
+    print(f"{total} events over {days} days: {elapsed * 1000:.1f} ms total, "
+          f"{elapsed * 1000 / days:.2f} ms/day, {elapsed * 1e6 / total:.1f} us/event, widest {widest} lanes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Write latency under heavy reads: one shared pool against app/db.py's read/write split.
+
+    python scripts/bench_read_write_pools.py [seconds] [readers]
+
+Reader threads repeatedly load every task (a coach-context or export render) while one
+thread completes tasks one commit at a time. "shared" is the old setup, where both go
+through one read-write pool; "split" sends reads to read-only connections and writes to
+the single-connection writer. Both use the balanced (WAL) profile. Scratch directory only.
+"""
+from __future__ import annotations
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+
+from app import models  # noqa: E402,F401
+from app.db import READ_POOL_SIZE, SQLITE_PROFILES, Base, apply_sqlite_pragmas  # noqa: E402
+
+ROWS = 20000
+_READ = "SELECT * FROM tasks ORDER BY created_at DESC"
+_WRITE = "UPDATE tasks SET status = :status, completed_at = CURRENT_TIMESTAMP WHERE id = :id"
+
+
+def _engine(url: str, pragmas: dict[str, str], **kwargs):
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **kwargs)
+    event.listen(engine, "connect", lambda conn, record: apply_sqlite_pragmas(conn, pragmas))
+    return engine
+
+
+def _run(path: str, layout: str, seconds: float, readers: int) -> dict:
+    pragmas = SQLITE_PROFILES["balanced"]
+    if layout == "shared":
+        writer = reader = _engine(f"sqlite:///{path}", pragmas)
+    else:
+        read_pragmas = {k: v for k, v in pragmas.items() if k != "journal_mode"}
+        writer = _engine(f"sqlite:///{path}", pragmas, pool_size=1, max_overflow=0)
+        reader = _engine(
+            f"sqlite:///file:{path}?mode=ro&uri=true",
+            read_pragmas,
+            pool_size=READ_POOL_SIZE,
+            max_overflow=READ_POOL_SIZE,
+        )
+    write_ms: list[float] = []
+    reads = [0]
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def write_loop() -> None:
+        rng = random.Random(3)
+        while not stop.is_set():
+            started = time.perf_counter()
+            with writer.begin() as conn:
+                conn.exec_driver_sql(_WRITE, {"status": rng.choice(("done", "pending")), "id": rng.randint(1, ROWS)})
+            write_ms.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.005)  # clicks, not a bulk load
+
+    def read_loop() -> None:
+        while not stop.is_set():
+            with reader.connect() as conn:
+                conn.exec_driver_sql(_READ).fetchall()
+            with lock:
+                reads[0] += 1
+
+    threads = [threading.Thread(target=write_loop)] + [threading.Thread(target=read_loop) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    for bind in {writer, reader}:
+        bind.dispose()
+    write_ms.sort()
+    return {
+        "reads": reads[0] / seconds,
+        "writes": len(write_ms) / seconds,
+        "p50": statistics.median(write_ms),
+        "p95": write_ms[min(len(write_ms) - 1, int(len(write_ms) * 0.95))],
+    }
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    path = os.path.join(tempfile.mkdtemp(prefix="sfo-pools-"), "bench.db")
+    seed = _engine(f"sqlite:///{path}", SQLITE_PROFILES["balanced"])
+    Base.metadata.create_all(bind=seed)
+    with seed.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO tasks (verb_noun, when_bucket, status, frog, owner_type) "
+            "VALUES (:name, 'later', 'pending', 0, 'mine')",
+            [{"name": f"Task {i}"} for i in range(ROWS)],
+        )
+    seed.dispose()
+
+    print(f"{seconds:.0f}s per layout, 1 writer + {readers} full-table readers, {ROWS} tasks")
+    print(f"{'layout':<8} {'reads/s':>8} {'writes/s':>9} {'write p50 ms':>13} {'write p95 ms':>13}")
+    for layout in ("shared", "split"):
+        result = _run(path, layout, seconds, readers)
+        print(
+            f"{layout:<8} {result['reads']:>8.1f} {result['writes']:>9.0f} "
+            f"{result['p50']:>13.2f} {result['p95']:>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare read/write throughput of the SQLite storage profiles in app/db.py.
+
+    python scripts/bench_sqlite_profiles.py [seconds] [readers]
+
+For each profile, a fresh scratch database gets one writer thread committing single-row
+task updates (a "complete task" click) while reader threads page through open tasks
+(a polling page render), all for the same wall time. Reports commits/s, reads/s and how
+many operations failed with "database is locked". The real sfo.db is never touched.
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.db import SQLITE_PROFILES, Base, apply_sqlite_pragmas  # noqa: E402
+from app import models  # noqa: E402,F401
+
+ROWS = 5000
+_UPDATE = "UPDATE tasks SET status = :status, priority = :priority WHERE id = :id"
+_READ = (
+    "SELECT id, verb_noun, when_bucket, status FROM tasks "
+    "WHERE when_bucket = :bucket AND status = 'pending' ORDER BY id LIMIT 50"
+)
+
+
+def _engine(path: str, pragmas: dict[str, str]):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", lambda conn, record: apply_sqlite_pragmas(conn, pragmas))
+    return engine
+
+
+def _seed(engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    rows = [
+        {"verb_noun": f"Task {i}", "when_bucket": ("today", "week", "later")[i % 3], "status": "pending",
+         "frog": False, "owner_type": "mine"}
+        for i in range(ROWS)
+    ]
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO tasks (verb_noun, when_bucket, status, frog, owner_type) "
+            "VALUES (:verb_noun, :when_bucket, :status, :frog, :owner_type)",
+            rows,
+        )
+
+
+def _run(name: str, pragmas: dict[str, str], seconds: float, readers: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix=f"sfo-{name}-"), "bench.db")
+    engine = _engine(path, pragmas)
+    _seed(engine)
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def _tally(key: str) -> None:
+        with lock:
+            counts[key] += 1
+
+    def writer() -> None:
+        rng = random.Random(1)
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.exec_driver_sql(
+                        _UPDATE,
+                        {"status": rng.choice(("pending", "done")), "priority": rng.randint(1, 5),
+                         "id": rng.randint(1, ROWS)},
+                    )
+                _tally("writes")
+            except OperationalError:
+                _tally("locked")
+
+    def reader(seed: int) -> None:
+        rng = random.Random(seed)
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.exec_driver_sql(_READ, {"bucket": rng.choice(("today", "week", "later"))}).fetchall()
+                _tally("reads")
+            except OperationalError:
+                _tally("locked")
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader, args=(i,)) for i in range(readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return {key: value / seconds if key != "locked" else value for key, value in counts.items()}
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    print(f"{seconds:.0f}s per profile, 1 writer + {readers} readers, {ROWS} tasks")
+    print(f"{'profile':<10} {'commits/s':>10} {'reads/s':>10} {'locked':>8}")
+    for name, pragmas in SQLITE_PROFILES.items():
+        result = _run(name, pragmas, seconds, readers)
+        print(f"{name:<10} {result['writes']:>10.0f} {result['reads']:>10.0f} {result['locked']:>8}")
+
+
+if __name__ == "__main__":
+    main()
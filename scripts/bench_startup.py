@@ -0,0 +1,61 @@
+"""Time the schema step of startup: versioned migrations against the old per-boot probing.
+
+    python scripts/bench_startup.py [runs]
+
+Runs in a scratch directory, so the real sfo.db is never touched. Reports a cold start
+(empty database), then warm starts through run_migrations() and through the previous
+create_all + ensure_* sequence, which every boot used to pay.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+# The engine opens ./sfo.db relative to the working directory.
+os.chdir(tempfile.mkdtemp(prefix="sfo-bench-"))
+
+from app import db  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+from app.utils.health import ensure_health_metrics  # noqa: E402
+
+
+def _legacy_probe() -> None:
+    db.Base.metadata.create_all(bind=db.engine)
+    db.ensure_task_owner_column()
+    db.ensure_task_resurface_columns()
+    db.ensure_block_title_column()
+    db.ensure_ritual_table()
+    db.ensure_ritual_columns()
+    db.ensure_guidance_reminder_columns()
+    db.ensure_coach_message_context_column()
+    db.ensure_coach_conversation_summary_columns()
+    ensure_health_metrics()
+
+
+def _time(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        # Drop pooled connections so each run pays the connect a fresh worker would.
+        db.engine.dispose()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    cold = _time(run_migrations, 1)
+    print(f"cold start (empty db):       {cold:8.2f} ms")
+    print(f"warm, per-boot probing:      {_time(_legacy_probe, runs):8.2f} ms (median of {runs})")
+    print(f"warm, versioned migrations:  {_time(run_migrations, runs):8.2f} ms (median of {runs})")
+
+
+if __name__ == "__main__":
+    main()
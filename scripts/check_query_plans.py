@@ -0,0 +1,259 @@
+"""Query-plan regression check: fail when a page's queries fully scan a large table.
+
+    python scripts/check_query_plans.py [-v]
+
+Builds a scratch database through the migrations, seeds a few thousand rows, requests
+every GET page and endpoint plus the hot write handlers (POSTS), and runs EXPLAIN QUERY
+PLAN on each distinct statement they issued. Exits 1 if any plan contains `SCAN <table>`
+for a table in LARGE_TABLES, unless every route that issued it is allowed that scan in
+ALLOWED_SCANS; -v prints every plan. The real sfo.db is never touched.
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+# The engine opens ./sfo.db and the app serves ./app/static, both relative to the cwd.
+_scratch = Path(tempfile.mkdtemp(prefix="sfo-plans-"))
+(_scratch / "app").symlink_to(REPO_ROOT / "app")
+os.chdir(_scratch)
+for _name in ("SFO_PASSWORD", "COZI_ICS_URL", "SFO_CALENDAR_FEEDS"):
+    os.environ[_name] = ""
+# Write handlers need a CSRF token; the API key header stands in for one.
+os.environ["SFO_API_TOKEN"] = API_TOKEN = "check-query-plans"
+os.environ.setdefault("SFO_LLM_PROVIDER", "lite")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.db import SessionLocal, engine, read_engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Block,
+    BlockType,
+    CoachContext,
+    CoachConversation,
+    CoachMessage,
+    GuidanceEvent,
+    GuidanceReminder,
+    HealthEntry,
+    HealthMetric,
+    Project,
+    ProjectCategory,
+    RitualEntry,
+    RitualType,
+    Task,
+    TaskStatus,
+    WhenBucket,
+)
+
+# Tables that grow with use; a full scan of one of these gets slower every day.
+LARGE_TABLES = {
+    "tasks",
+    "blocks",
+    "health_entries",
+    "ritual_entries",
+    "coach_messages",
+    "guidance_reminders",
+    "guidance_events",
+}
+# (path, table) pairs whose scan is deliberate, with the reason.
+ALLOWED_SCANS: dict[tuple[str, str], str] = {
+    ("/blocks", "blocks"): "the page lists every block",
+    ("/blocks", "tasks"): "ready-to-schedule filters on nullable columns most tasks match",
+    ("/tasks", "tasks"): "the board shows every task across its tabs",
+    ("/api/tasks", "tasks"): "the endpoint returns every task",
+    ("/coach/context", "tasks"): "whole-history snapshot, rebuilt only when the table changes",
+    ("/coach/context", "blocks"): "whole-history snapshot, rebuilt only when the table changes",
+    ("/coach/context", "ritual_entries"): "whole-history snapshot, rebuilt only when the table changes",
+}
+
+PATHS = [
+    "/",
+    "/calendar/week",
+    "/calendar/changes?view=day",
+    "/calendar/changes?view=week",
+    "/inbox/more?before={inbox_cursor}",
+    "/blocks",
+    "/capture",
+    "/capture/wizard",
+    "/tasks",
+    "/waiting",
+    "/resurface",
+    "/weekly",
+    "/weekly/wizard",
+    "/ritual/morning",
+    "/ritual/midday",
+    "/ritual/evening",
+    "/long-term",
+    "/long-term/pyramid",
+    "/long-term/roadmaps",
+    "/health",
+    "/health/diet",
+    "/health/weight",
+    "/health/fitness",
+    "/health/strength",
+    "/health/flexibility",
+    "/profile",
+    "/onboarding",
+    "/export",
+    "/nudges",
+    "/coach/history",
+    "/coach/context?screen=home",
+    "/api/projects",
+    "/api/tasks",
+]
+# (path, request kwargs) for write handlers; path and values are formatted with the seed ids.
+POSTS = [
+    ("/coach/message", {"json": {"message": "What next?", "screen_context": {"screen": {"id": "home"}}}}),
+    ("/coach/message", {"json": {"message": "And then?", "context_id": "plans-context"}}),
+    ("/tasks/complete", {"data": {"task_id": "{task_id}"}}),
+    ("/tasks/reopen", {"data": {"task_id": "{task_id}"}}),
+    ("/resurface/{task_id}", {}),
+    ("/nudges/{reminder_id}/snooze", {"json": {"minutes": 30}}),
+    ("/nudges/displacement/ack", {"json": {"capture_kind": "task", "title": "Plans"}}),
+    ("/health/entry", {"data": {"metric_id": "{metric_id}", "value": "42"}}),
+]
+
+
+def _seed() -> dict:
+    rng = random.Random(7)
+    today = date.today()
+    with SessionLocal() as db:
+        projects = [
+            Project(title=f"Project {i}", category=rng.choice(list(ProjectCategory)), active_this_week=i < 3)
+            for i in range(40)
+        ]
+        db.add_all(projects)
+        db.flush()
+        for i in range(3000):
+            db.add(
+                Task(
+                    verb_noun=f"Do thing {i}",
+                    project_id=rng.choice(projects).id,
+                    when_bucket=rng.choice(list(WhenBucket)),
+                    status=rng.choice(list(TaskStatus)),
+                    resurface_on=today + timedelta(days=rng.randint(-200, 200)) if i % 5 == 0 else None,
+                    completed_at=datetime.now() - timedelta(days=rng.randint(0, 400)) if i % 3 == 0 else None,
+                )
+            )
+        for i in range(3000):
+            start = time(rng.randint(6, 20), rng.choice((0, 30)))
+            db.add(
+                Block(
+                    date=today + timedelta(days=rng.randint(-700, 30)),
+                    start_time=start,
+                    end_time=time(start.hour + 1, start.minute),
+                    block_type=rng.choice(list(BlockType)),
+                    project_id=rng.choice(projects).id,
+                )
+            )
+        metrics = db.query(HealthMetric).all()
+        for i in range(3000):
+            db.add(
+                HealthEntry(
+                    metric_id=rng.choice(metrics).id,
+                    entry_date=today - timedelta(days=rng.randint(0, 700)),
+                    value=rng.random() * 100,
+                )
+            )
+        for offset in range(700):
+            for ritual_type in RitualType:
+                db.add(RitualEntry(ritual_type=ritual_type, entry_date=today - timedelta(days=offset)))
+        convo = CoachConversation()
+        db.add(convo)
+        db.flush()
+        for i in range(2000):
+            db.add(CoachMessage(conversation_id=convo.id, role=("user", "assistant")[i % 2], content=f"msg {i}"))
+        for i in range(2000):
+            db.add(GuidanceEvent(code=rng.choice(("weekly_review_done", "nudge_shown", "coach_open")), context_json="{}"))
+            db.add(
+                GuidanceReminder(
+                    code=rng.choice(("weekly_review", "midday_reset", "inbox_zero")),
+                    title="Reminder",
+                    body="Body",
+                    period_start=today - timedelta(days=7 * rng.randint(0, 100)),
+                )
+            )
+        # A context issued by a page render that this process never saw (another worker).
+        db.add(CoachContext(id="plans-context", context_json='{"screen": {"id": "home"}}'))
+        db.commit()
+        cursor = db.query(Task.id).order_by(Task.id.desc()).offset(25).limit(1).scalar()
+        return {
+            "inbox_cursor": cursor,
+            "task_id": db.query(Task.id).filter(Task.resurface_on.isnot(None)).limit(1).scalar(),
+            "reminder_id": db.query(GuidanceReminder.id).limit(1).scalar(),
+            "metric_id": metrics[0].id,
+        }
+
+
+def _format(value, params: dict):
+    if isinstance(value, str):
+        return value.format(**params)
+    if isinstance(value, dict):
+        return {key: _format(item, params) for key, item in value.items()}
+    return value
+
+
+def main() -> int:
+    verbose = "-v" in sys.argv[1:]
+    app = create_app()
+    params = _seed()
+
+    # statement -> (every route that issued it, parameters of its first run)
+    statements: dict[str, tuple[set[str], object]] = {}
+    current = {"path": ""}
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE")):
+            return
+        if executemany and parameters and isinstance(parameters[0], (tuple, list, dict)):
+            # insertmanyvalues batches arrive flattened; true executemany runs as a list.
+            parameters = parameters[0]
+        paths, _ = statements.setdefault(statement, (set(), parameters))
+        paths.add(current["path"])
+
+    for bind in (engine, read_engine):
+        event.listen(bind, "before_cursor_execute", _capture)
+    with TestClient(app, headers={"X-API-Key": API_TOKEN}) as client:
+        requests = [("GET", template, {}) for template in PATHS]
+        requests += [("POST", template, kwargs) for template, kwargs in POSTS]
+        for method, template, kwargs in requests:
+            path = template.format(**params)
+            current["path"] = template.split("?")[0]
+            resp = client.request(method, path, follow_redirects=False, **_format(kwargs, params))
+            if resp.status_code >= 400:
+                print(f"warning: {method} {path} -> {resp.status_code}")
+    for bind in (engine, read_engine):
+        event.remove(bind, "before_cursor_execute", _capture)
+
+    failures = []
+    with engine.connect() as conn:
+        for statement, (paths, parameters) in statements.items():
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+            details = [row[-1] for row in plan]
+            if verbose:
+                print(f"{', '.join(sorted(paths))}: {' '.join(statement.split())[:160]}")
+                for detail in details:
+                    print(f"    {detail}")
+            for detail in details:
+                words = detail.split()
+                if len(words) >= 2 and words[0] == "SCAN" and words[1] in LARGE_TABLES:
+                    for path in sorted(paths):
+                        if (path, words[1]) not in ALLOWED_SCANS:
+                            failures.append((path, detail, " ".join(statement.split())))
+
+    print(f"checked {len(statements)} distinct statements from {len(PATHS) + len(POSTS)} requests")
+    for path, detail, statement in failures:
+        print(f"FULL SCAN  {path}: {detail}\n    {statement[:300]}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())